@@ -0,0 +1,20 @@
+import json
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+API_PREFIX = "/api/v2/"
+
+def fixture_key(url):
+    """Key a request by its path below /api/v2/ and its sorted query: 'pokemon?limit=100&offset=0'"""
+    parts = urlsplit(url)
+    path = parts.path.split(API_PREFIX, 1)[-1].strip("/")
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    return f"{path}?{query}" if query else path
+
+def load_fixtures(path):
+    """Return {fixture key: response body (bytes)}"""
+    with open(path, encoding="utf-8") as f:
+        return {key: body.encode("utf-8") for key, body in json.load(f).items()}
+
+def save_fixtures(path, fixtures):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({key: body.decode("utf-8") for key, body in sorted(fixtures.items())}, f)
@@ -0,0 +1,24 @@
+import argparse
+import requests
+from bench.fixtures import save_fixtures
+from bench.scenarios import SCENARIOS, run_quietly
+from bench.transport import RecordingAdapter
+from src.misc.client import PokeApiClient
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record PokeAPI responses used by the benchmark scenarios")
+    parser.add_argument("fixtures", help="Fixture file to write")
+    parser.add_argument("--base-url", default=PokeApiClient.BASE_URL)
+    args = parser.parse_args()
+
+    fixtures = {}
+    session = requests.Session()
+    session.mount(args.base_url.split("/api/")[0] + "/", RecordingAdapter(fixtures, pool_maxsize=8))
+    # Uncached so every request the scenarios make goes through the recorder
+    client = PokeApiClient(args.base_url, use_cache=False, session=session)
+    client.prefetch = lambda endpoints: None
+    for name, (setup, run) in SCENARIOS.items():
+        print(f"Recording {name}...")
+        run_quietly(run, client, run_quietly(setup, client))
+    save_fixtures(args.fixtures, fixtures)
+    print(f"Saved {len(fixtures)} fixtures to {args.fixtures}")
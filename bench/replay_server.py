@@ -0,0 +1,65 @@
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from bench.fixtures import fixture_key, load_fixtures
+
+class ReplayServer(ThreadingHTTPServer):
+    """Local stand-in for PokeAPI that replays recorded fixtures with latency and jitter"""
+    daemon_threads = True
+
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, port=0, seed=0):
+        super().__init__(("127.0.0.1", port), _ReplayHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.counts = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}/api/v2"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def delay(self):
+        with self._lock:
+            return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        key = fixture_key(self.path)
+        with self.server._lock:
+            self.server.counts[key] += 1
+        time.sleep(self.server.delay())
+        body = self.server.fixtures.get(key)
+        if body is None:
+            self.send_response(404)
+            body = b"Not Found"
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded PokeAPI fixtures")
+    parser.add_argument("fixtures")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Random +/- seconds around the latency")
+    args = parser.parse_args()
+    server = ReplayServer(load_fixtures(args.fixtures), args.latency, args.jitter, args.port)
+    print(f"Replaying {len(server.fixtures)} fixtures at {server.base_url}")
+    server.serve_forever()
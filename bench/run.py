@@ -0,0 +1,127 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+import requests
+from bench.fixtures import load_fixtures
+from bench.replay_server import ReplayServer
+from bench.scenarios import SCENARIOS, run_quietly
+from bench.transport import ReplayAdapter
+from src.misc.client import PokeApiClient
+
+REPLAY_HOST = "http://replay.invalid/"
+
+class Bench:
+    """Runs the startup and command scenarios against recorded fixtures"""
+
+    def __init__(self, fixtures, latency, jitter, transport, repeat):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.transport = transport
+        self.repeat = repeat
+        if transport == "server":
+            self.server = ReplayServer(fixtures, latency, jitter).start()
+            self.counts = self.server.counts
+            self.base_url = self.server.base_url
+        else:
+            self.adapter = ReplayAdapter(fixtures, latency, jitter)
+            self.counts = self.adapter.counts
+            self.base_url = f"{REPLAY_HOST}api/v2"
+
+    def new_client(self):
+        session = requests.Session()
+        if self.transport == "adapter":
+            session.mount(REPLAY_HOST, self.adapter)
+        client = PokeApiClient(self.base_url, session=session)
+        client.prefetch = lambda endpoints: None # Keep request counts deterministic
+        return client
+
+    def settle(self, client):
+        """Wait for the background index refresh so it is not counted against a scenario"""
+        if client.refresh_thread:
+            client.refresh_thread.join()
+        return client
+
+    def measure(self, func, *args):
+        """Return (result, seconds, requests) for one call"""
+        before = sum(self.counts.values())
+        start = time.perf_counter()
+        result = run_quietly(func, *args)
+        seconds = time.perf_counter() - start
+        return result, seconds, sum(self.counts.values()) - before
+
+    def peak_memory(self, func, *args):
+        tracemalloc.start()
+        try:
+            run_quietly(func, *args)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def run(self):
+        results = {"startup": {}, "commands": {}}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            os.environ["XDG_CACHE_HOME"] = cache_dir # Cold means an empty cache and no snapshot
+            client, seconds, count = self.measure(self.new_client)
+            results["startup"]["cold"] = {"seconds": seconds, "requests": count}
+            warm = []
+            for _ in range(self.repeat):
+                client, seconds, count = self.measure(self.new_client)
+                warm.append((seconds, count))
+                self.settle(client)
+            results["startup"]["warm"] = {
+                "seconds": statistics.median(seconds for seconds, _ in warm),
+                "requests": max(count for _, count in warm),
+                "peak_bytes": self.peak_memory(self.new_client)
+            }
+
+            for name, (setup, run) in SCENARIOS.items():
+                client = self.settle(self.new_client())
+                client.cache.clear() # Keep the snapshot, drop every cached response
+                state = run_quietly(setup, client)
+                _, cold_seconds, cold_count = self.measure(run, client, state)
+                warm = [self.measure(run, client, state)[1:] for _ in range(self.repeat)]
+                results["commands"][name] = {
+                    "cold": {"seconds": cold_seconds, "requests": cold_count},
+                    "warm": {
+                        "seconds": statistics.median(seconds for seconds, _ in warm),
+                        "requests": max(count for _, count in warm)
+                    },
+                    "peak_bytes": self.peak_memory(run, client, state)
+                }
+        return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Pokedex CLI against recorded PokeAPI fixtures")
+    parser.add_argument("fixtures", help="Fixture file written by bench.record")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Random +/- seconds around the latency")
+    parser.add_argument("--transport", choices=["server", "adapter"], default="server",
+                        help="Replay over a local HTTP server or an in-process requests adapter")
+    parser.add_argument("--repeat", type=int, default=5, help="Warm runs per measurement, the median is reported")
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    bench = Bench(load_fixtures(args.fixtures), args.latency, args.jitter, args.transport, args.repeat)
+    report = {
+        "meta": {
+            "time": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "transport": args.transport,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "fixtures": len(bench.fixtures)
+        }
+    } | bench.run()
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
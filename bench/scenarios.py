@@ -0,0 +1,39 @@
+import io
+from contextlib import redirect_stdout
+from src.cmd.pokedex_cmd import PokedexCommands
+from src.cmd.pokemon_cmd import PokemonCommands
+from src.misc.util import capture_output
+
+POKEMON = "pikachu"
+VERSION = "sword-shield"
+MOVE = "thunderbolt"
+TEAM = ["pikachu", "charizard", "blastoise", "venusaur", "gengar", "snorlax"]
+
+class ScenarioError(Exception):
+    """Raised when a benchmarked command reports an error instead of a result"""
+
+def run_quietly(func, *args):
+    """Run func with printing and pretty printing silenced, raising on reported errors"""
+    with redirect_stdout(io.StringIO()), capture_output() as records:
+        result = func(*args)
+    errors = [record["data"] for record in records if record["type"] == "error"]
+    if errors:
+        raise ScenarioError("; ".join(errors))
+    return result
+
+def choose(client):
+    return PokemonCommands(POKEMON, client.pokemon_dict[POKEMON], client)
+
+def choose_with_version(client):
+    context = choose(client)
+    context.onecmd(f"version {VERSION}")
+    return context
+
+# Name: (setup(client) -> state, run(client, state)). Only run is measured.
+SCENARIOS = {
+    "move": (PokedexCommands, lambda client, commands: commands.onecmd(f"move {MOVE}")),
+    "compare": (PokedexCommands, lambda client, commands: commands.onecmd(f"compare {' '.join(TEAM)}")),
+    "choose": (lambda client: None, lambda client, state: choose(client)),
+    "moves": (PokedexCommands, lambda client, commands: commands.onecmd(f"moves {POKEMON}")),
+    "abilities": (choose_with_version, lambda client, context: context.onecmd("abilities")),
+}
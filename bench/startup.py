@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Modules that should only load on first use, never while starting up
+DEFERRED = ["requests", "urllib3", "asyncio", "sqlite3", "colorama", "yaml", "difflib", "orjson", "numpy",
+            "src.misc.store"]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b"pokedex> "
+# Slow or busy machines can scale every budget, e.g. STARTUP_BUDGET_SCALE=2
+BUDGET_SCALE = float(os.environ.get("STARTUP_BUDGET_SCALE", "1"))
+
+def import_profile(module="main"):
+    """Import a module in a fresh interpreter, returns ({module: cumulative us}, total us)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times, times[module]
+
+def seed_snapshot(pokemon=1350):
+    """Write a warm name index snapshot of a full sized roster, as a returning user has"""
+    from src.misc.client import PokeApiClient
+    from src.misc.snapshot import save_snapshot
+    base_url = PokeApiClient.BASE_URL
+    save_snapshot(base_url, {
+        "pokemon": {f"pokemon-{i}": f"{base_url}/pokemon/{i}/" for i in range(1, pokemon + 1)},
+        "versions": ["red-blue", "scarlet-violet"],
+        "names": {}
+    })
+
+def launch_ms(args, env):
+    """Milliseconds from launching an interpreter with args until it shows the first prompt or exits"""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *args], cwd=ROOT, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    output = b""
+    try:
+        while not output.endswith(PROMPT):
+            chunk = os.read(process.stdout.fileno(), 4096)
+            if not chunk:
+                break
+            output += chunk
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        process.kill()
+        process.wait()
+        process.stdin.close()
+        process.stdout.close()
+    return elapsed, output
+
+def prompt_profile(repeat):
+    """Fastest time to the first prompt with a warm snapshot, and of a bare interpreter, in ms"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = os.environ | {"XDG_CACHE_HOME": cache_dir}
+        previous = os.environ.get("XDG_CACHE_HOME")
+        os.environ["XDG_CACHE_HOME"] = cache_dir
+        try:
+            seed_snapshot()
+        finally:
+            if previous is None:
+                del os.environ["XDG_CACHE_HOME"]
+            else:
+                os.environ["XDG_CACHE_HOME"] = previous
+        bare = min(launch_ms(["-c", "pass"], env)[0] for _ in range(repeat))
+        prompts = []
+        for _ in range(repeat):
+            elapsed, output = launch_ms(["main.py"], env)
+            if not output.endswith(PROMPT):
+                raise RuntimeError(f"main.py exited before its first prompt: {output.decode(errors='replace')}")
+            prompts.append(elapsed)
+    return min(prompts), bare
+
+def check(budget_ms, prompt_budget_ms, repeat):
+    """Measure startup imports and the time to the first prompt, returns (report, failures).
+    The fastest of repeat runs is compared to the budgets, scaled by BUDGET_SCALE."""
+    budget_ms, prompt_budget_ms = budget_ms * BUDGET_SCALE, prompt_budget_ms * BUDGET_SCALE
+    times, totals = {}, []
+    for _ in range(repeat):
+        times, total = import_profile()
+        totals.append(total / 1000)
+    loaded = [name for name in DEFERRED if name in times]
+    fastest = min(totals)
+    failures = [f"{name} is imported at startup" for name in loaded]
+    if fastest > budget_ms:
+        failures.append(f"importing main took {fastest:.1f} ms, the budget is {budget_ms:g} ms")
+    # The interpreter's own startup varies by machine, only what main adds to it is budgeted
+    prompt, bare = prompt_profile(repeat)
+    if prompt - bare > prompt_budget_ms:
+        failures.append(f"the first prompt took {prompt - bare:.1f} ms past interpreter startup, "
+                        f"the budget is {prompt_budget_ms:g} ms")
+    slowest = sorted(((us, name) for name, us in times.items() if name.startswith("src.")), reverse=True)
+    report = {
+        "import_ms": round(fastest, 1),
+        "budget_ms": budget_ms,
+        "prompt_ms": round(prompt - bare, 1),
+        "prompt_budget_ms": prompt_budget_ms,
+        "interpreter_ms": round(bare, 1),
+        "deferred_loaded": loaded,
+        "slowest_modules_ms": {name: round(us / 1000, 1) for us, name in slowest[:5]}
+    }
+    return report, failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the CLI's import time against a startup budget")
+    parser.add_argument("--budget-ms", type=float, default=60, help="Time allowed to import main")
+    parser.add_argument("--prompt-budget-ms", type=float, default=150,
+                        help="Time allowed from interpreter startup to the first prompt, with a warm snapshot")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to measure, the fastest counts")
+    args = parser.parse_args()
+
+    report, failures = check(args.budget_ms, args.prompt_budget_ms, args.repeat)
+    print(json.dumps(report, indent=2))
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
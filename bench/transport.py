@@ -0,0 +1,56 @@
+import random
+import threading
+import time
+from collections import Counter
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from bench.fixtures import fixture_key
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport that records every successful response as a fixture"""
+
+    def __init__(self, fixtures, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            with self._lock:
+                self.fixtures[fixture_key(request.url)] = response.content
+        return response
+
+class ReplayAdapter(BaseAdapter):
+    """Transport that answers from recorded fixtures with simulated latency, no sockets involved"""
+
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, seed=0):
+        super().__init__()
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.counts = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        key = fixture_key(request.url)
+        with self._lock:
+            self.counts[key] += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        time.sleep(delay)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        body = self.fixtures.get(key)
+        if body is None:
+            response.status_code = 404
+            response._content = b"Not Found"
+        else:
+            response.status_code = 200
+            response._content = body
+            response.headers["Content-Type"] = "application/json; charset=utf-8"
+        return response
+
+    def close(self):
+        pass
@@ -1,6 +1,96 @@
+import argparse
+import os
+import sys
+from contextlib import redirect_stdout
 from src.context.pokedex_cli import PokedexCLI
+from src.context.batch import BatchRunner
 from src.misc.client import PokeApiClient
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Interactive Pokedex backed by PokeAPI")
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve every request from the local store, with no network I/O")
+    parser.add_argument("--store",
+                        help="Path of the local store used by --offline and the import options")
+    parser.add_argument("--import-dump", metavar="DIR",
+                        help="Build the local store from a PokeAPI api-data checkout and exit")
+    parser.add_argument("--import-cache", action="store_true",
+                        help="Build the local store from responses cached by earlier runs and exit")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Run the commands in FILE ('-' for stdin) without prompts and print NDJSON results")
+    parser.add_argument("--jobs", type=int, default=4,
+                        help="Independent batch commands to run in parallel")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Append a JSON line per request and command to FILE")
+    parser.add_argument("--insecure", action="store_true",
+                        help="Skip SSL verification instead of failing (batch mode never prompts)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Serve one warm client to other sessions over a Unix socket")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="Socket of the daemon to serve or attach to")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Use a local client even when a daemon is running")
+    parser.add_argument("--retry-prompt", action="store_true",
+                        help="Ask whether to retry once automatic retries of a request run out")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    client = PokeApiClient()
-    PokedexCLI(client).cmdloop()
\ No newline at end of file
+    args = parse_args()
+    if args.offline or args.import_dump or args.import_cache:
+        # The SQLite backed store is only loaded when asked for
+        from src.misc.store import LocalStore, default_store_path
+        args.store = args.store or default_store_path()
+    if args.import_dump or args.import_cache:
+        store = LocalStore(args.store)
+        if args.import_dump:
+            print(f"Imported {store.import_dump(args.import_dump)} resources from {args.import_dump}")
+        if args.import_cache:
+            from src.misc.cache import ResponseCache
+            print(f"Imported {store.import_cache(ResponseCache(), PokeApiClient.BASE_URL)} cached responses")
+        exit(0)
+
+    store = None
+    if args.offline:
+        store = LocalStore(args.store)
+        if not len(store):
+            print(f"The local store at {args.store} is empty, build it with --import-dump or --import-cache")
+            exit(1)
+    if args.daemon:
+        from src.misc.daemon import PokedexDaemon
+        client = PokeApiClient(store=store, interactive=False, verify_ssl=not args.insecure, trace=args.trace)
+        with PokedexDaemon(client, args.socket) as daemon:
+            print(f"Serving the Pokedex on {daemon.path}, Ctrl+C to stop")
+            try:
+                daemon.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        exit(0)
+
+    client = None
+    if not (args.offline or args.no_daemon):
+        from src.misc.daemon import default_socket_path
+        socket_path = args.socket or default_socket_path()
+        # The daemon's client is shared, so options of a single session cannot apply to it
+        local_only = [flag for flag, value in
+                      (("--insecure", args.insecure), ("--trace", args.trace), ("--retry-prompt", args.retry_prompt)) if value]
+        if os.path.exists(socket_path) and local_only:
+            print(f"{', '.join(local_only)} cannot apply to the shared daemon at {socket_path}, "
+                  "running a local client instead", file=sys.stderr)
+        elif os.path.exists(socket_path):
+            from src.misc.daemon import DaemonClient
+            try:
+                client = DaemonClient(socket_path)
+            except OSError:
+                pass  # Stale socket, run a local client instead
+
+    if args.batch:
+        if client is None:
+            with redirect_stdout(sys.stderr): # Keep progress messages out of the NDJSON stream
+                client = PokeApiClient(store=store, interactive=False, verify_ssl=not args.insecure, trace=args.trace)
+        with (sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")) as script:
+            BatchRunner(client, jobs=args.jobs).run(script.readlines())
+        exit(0)
+
+    if client is None:
+        client = PokeApiClient(store=store, verify_ssl=not args.insecure, trace=args.trace, retry_prompt=args.retry_prompt)
+    PokedexCLI(client).cmdloop()
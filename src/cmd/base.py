@@ -1,12 +1,21 @@
 from cmd import Cmd
 from traceback import print_exc
-import requests
+from src.misc.lazy import LazyModule
+from src.misc.util import pretty_error, pretty_print_dict, pretty_compare
+
+requests = LazyModule("requests") # Only needed once a request has failed
 
 class BaseCommands(Cmd):
     """Base class for all commands"""
         
     def onecmd(self, line):
-        """Override Cmd.onecmd to handle exceptions and expand help"""
+        """Override Cmd.onecmd to time each command for the perf report"""
+        command = line.split()[0] if line.strip() else ""
+        with self.client.metrics.command(command):
+            return self._onecmd(line)
+
+    def _onecmd(self, line):
+        """Handle exceptions and expand help"""
         try:
             stripped_line = line.strip()
             if not stripped_line:
@@ -44,11 +53,11 @@ class BaseCommands(Cmd):
                 return super().onecmd(line)
 
         except ValueError as e:
-            print(f"Invalid value: {str(e)}")
+            pretty_error(f"Invalid value: {str(e)}")
         except KeyError as e:
-            print(f"Not found: {str(e)}")
+            pretty_error(f"Not found: {str(e)}")
         except requests.RequestException as e:
-            print(f"Request error: {str(e)}")
+            pretty_error(f"Request error: {str(e)}")
         return False
 
     def emptyline(self):
@@ -61,6 +70,48 @@ class BaseCommands(Cmd):
             return
         print(f"Unknown command: {line}")
 
+    def do_perf(self, arg):
+        """Show request timings for this session: perf [endpoints|commands|reset|trace <file>|trace off]"""
+        args = arg.split()
+        metrics = self.client.metrics
+        if not args:
+            pretty_print_dict(metrics.endpoint_report(), "Requests by endpoint")
+            pretty_print_dict(metrics.command_report(), "Requests by command")
+            pretty_print_dict(metrics.events, "Events")
+        elif args == ["endpoints"]:
+            pretty_print_dict(metrics.endpoint_report(), "Requests by endpoint")
+        elif args == ["commands"]:
+            pretty_print_dict(metrics.command_report(), "Requests by command")
+        elif args == ["reset"]:
+            metrics.reset()
+            print("Performance counters reset.")
+        elif args == ["trace", "off"]:
+            metrics.trace_to(None)
+            print("Tracing stopped.")
+        elif len(args) == 2 and args[0] == "trace":
+            metrics.trace_to(args[1])
+            print(f"Tracing requests to {args[1]}")
+        else:
+            print("Unknown argument!")
+
+    def _print_evolution(self, pokemon):
+        """Compare the stats of every stage in a Pokemon's evolution family"""
+        stages = self.client.get_evolution(pokemon)
+        if len(stages) == 1:
+            print(f"{pokemon.capitalize()} does not evolve.")
+            return
+        table = {}
+        for stage in stages:
+            table[stage["pokemon"]] = {
+                "Stage": stage["stage"] + 1,
+                "Evolves By": stage["trigger"]
+            } | stage["stats"]
+        rows = dict.fromkeys(row for stats in table.values() for row in stats)
+        for stats in table.values():
+            for row in rows:
+                stats.setdefault(row, "None")
+        pretty_compare(table, "Evolution")
+
     def do_exit(self, arg):
         """Go back a level"""
         if arg:
@@ -1,6 +1,11 @@
 from src.context.pokemon_cli import PokemonCLI
 from src.cmd.base import BaseCommands
 from src.misc.util import *
+from src.misc.lazy import LazyModule
+from src.misc.stattable import STAT_COLUMNS
+from src.misc.sync import SYNC_FAMILIES
+
+requests = LazyModule("requests") # Only needed once a request has failed
 
 class PokedexError(Exception):
     """Exception raised for errors in the Pokedex commands."""
@@ -15,7 +20,33 @@ class PokedexCommands(BaseCommands):
     def _is_pokemon(self, name):
         """Check if a Pokemon exists by name"""
         return name.lower() in self.client.pokemon_names
+
+    def _complete_pokemon(self, text):
+        """Sorted Pokemon names starting with text, or the closest names to a typo"""
+        return self.client.pokemon_index.complete(text.lower().strip())
+
+    def _check_name(self, resource, name, label):
+        """Reject unknown move, ability or version names before any request is made.
+        Without a name list, such as a store imported without one, the request decides."""
+        try:
+            index = self.client.names(resource)
+        except (KeyError, requests.RequestException):
+            return True
+        if name.isdigit() or name in index:
+            return True
+        pretty_error(f"{label} not found: {name}")
+        suggestions = index.fuzzy(name, limit=5)
+        if suggestions:
+            print(f"Did you mean: {', '.join(suggestions)}?")
+        return False
         
+    def _complete_name(self, resource, text):
+        """Completions from a name list, none when the list cannot be loaded"""
+        try:
+            return self.client.names(resource).complete(text.lower().strip())
+        except (KeyError, requests.RequestException):
+            return []
+
     def do_search(self, arg):
         """Search for a Pokemon by name: search <pokemon>"""
         arg = arg.lower().strip()
@@ -27,14 +58,13 @@ class PokedexCommands(BaseCommands):
             print(f"Found {arg.capitalize()}!")
         else:
             print(f"Pokemon not found: {arg}")
+            suggestions = self.client.pokemon_index.fuzzy(arg, limit=5)
+            if suggestions:
+                print(f"Did you mean: {', '.join(suggestions)}?")
             
     def complete_search(self, text, line, begidx, endidx):
         """Autocomplete Pokemon names for search"""
-        text = text.lower().strip()
-        if not text:
-            return list(self.client.pokemon_names)[:50]
-        return [name for name in self.client.pokemon_names 
-                if name.startswith(text.lower())]
+        return self._complete_pokemon(text)
     
     def do_move(self, arg):
         """Get details about a move: 'move <move name>'"""
@@ -42,8 +72,14 @@ class PokedexCommands(BaseCommands):
             print("Please provide a move!")
             return
         arg = arg.strip().lower()
+        if not self._check_name("move", arg, "Move"):
+            return
         move_dict = self.client.get_usable_move(arg)
         pretty_print_dict(move_dict, arg)
+
+    def complete_move(self, text, line, begidx, endidx):
+        """Autocomplete move names"""
+        return self._complete_name("move", text)
     
     def do_choose(self, arg):
         """Choose a Pokemon: choose <pokemon>"""
@@ -60,11 +96,7 @@ class PokedexCommands(BaseCommands):
 
     def complete_choose(self, text, line, begidx, endidx):
         """Autocomplete Pokemon names for choose"""
-        text = text.lower().strip()
-        if not text:
-            return list(self.client.pokemon_names)[:50]
-        return [name for name in self.client.pokemon_names 
-                if name.startswith(text.lower())]
+        return self._complete_pokemon(text)
 
     def do_compare(self, args):
         """Compare two stats of two or more pokemon: compare <pokemon1> <pokemon2> ..."""
@@ -75,7 +107,9 @@ class PokedexCommands(BaseCommands):
             if not self._is_pokemon(pokemon):
                 print(f"'{pokemon}' is not a valid Pokemon!")
                 return
-            stats = self.client.get_stats(pokemon)
+
+        # Fetch every Pokemon in one concurrent wave
+        for pokemon, stats in zip(pokemon_names, self.client.get_stats_many(pokemon_names)):
             pokemon_stats[pokemon] = stats
         
         if len(pokemon_stats) < 2:
@@ -93,20 +127,120 @@ class PokedexCommands(BaseCommands):
 
     def complete_compare(self, text, line, begidx, endidx):
         """Autocomplete Pokemon names for compare"""
-        text = text.lower().strip().split()
-        if not text[0]:
-            return list(self.client.pokemon_names)[:50]
-        for pokemon in text:
-            if not self._is_pokemon(pokemon):
-                names = [name for name in self.client.pokemon_names 
-                if name.startswith(pokemon.lower())]
-                if not names:
-                    return []
-                else:
-                    return names
-        else:
-            return []
+        return self._complete_pokemon(text)
     
+    def do_coverage(self, args):
+        """Type weaknesses, coverage and suggested teammates for a team: coverage <pokemon1> ... <pokemon6>"""
+        team = list(dict.fromkeys(poke.lower().strip() for poke in args.split()))
+        if not 0 < len(team) <= 6:
+            print("Please provide one to six Pokemon!")
+            return
+
+        for pokemon in team:
+            if not self._is_pokemon(pokemon):
+                print(f"'{pokemon}' is not a valid Pokemon!")
+                return
+
+        report = self.client.coverage(team)
+        table = {pokemon: {pretty_string(type): mult for type, mult in defense.items()}
+                 for pokemon, defense in report["defense"].items()}
+        pretty_compare(table, "Damage Taken")
+
+        def members(counts):
+            """Types by how many team members they apply to, e.g. 'Ice (3), Rock (1)'"""
+            ranked = sorted((item for item in counts.items() if item[1]), key=lambda item: -item[1])
+            return ", ".join(f"{pretty_string(type)} ({count})" for type, count in ranked) or "None"
+
+        resisted = ", ".join(
+            "/".join(pretty_string(type) for type in pairing.split("/")) for pairing in report["resisted"]
+        ) or "None"
+        pretty_message(
+            f"Team weak to: {members(report['weak'])}\n"
+            f"Team resists: {members(report['resist'])}\n"
+            f"Super effective STAB against {report['covered']} of {report['pairings']} type pairings\n"
+            f"Resisted by: {resisted}"
+        )
+
+        if len(team) < 6:
+            teammates = {
+                name: {"Resists": resists, "Also Weak": shared, "New Coverage": coverage}
+                for name, resists, shared, coverage in self.client.suggest_teammates(team, limit=5)
+            }
+            if teammates:
+                pretty_compare(teammates, "Teammates")
+
+    def complete_coverage(self, text, line, begidx, endidx):
+        """Autocomplete Pokemon names for coverage"""
+        return self._complete_pokemon(text)
+
+    def _print_rows(self, rows, matches=None):
+        table = self.client.get_stat_table()
+        if not rows:
+            print("No Pokemon match!")
+            return
+        pretty_compare({table.names[i]: table.row(i) for i in rows})
+        if matches is not None and matches > len(rows):
+            print(f"Showing {len(rows)} of {matches} matches, use 'limit <n>' to see more")
+
+    def do_filter(self, args):
+        """Pokemon matching every condition: filter type=fire speed>100 [sort attack] [limit 10]"""
+        words = args.lower().split()
+        options = {"sort": None, "limit": "10"}
+        for option in options:
+            if option in words:
+                i = words.index(option)
+                if i + 1 >= len(words):
+                    print(f"Please provide a value for {option}!")
+                    return
+                options[option] = words[i + 1]
+                del words[i:i + 2]
+        if not words:
+            print("Please provide at least one condition, like speed>100 or type=fire")
+            return
+        if not options["limit"].isdigit():
+            print("Limit must be a number!")
+            return
+
+        table = self.client.get_stat_table()
+        rows = table.query(words, options["sort"], int(options["limit"]))
+        self._print_rows(rows, int(table.mask(words).sum()))
+
+    def do_rank(self, args):
+        """Top Pokemon by a stat, optionally filtered: rank <stat> [count] [conditions...]"""
+        words = args.lower().split()
+        if not words:
+            print("Please provide a stat, like speed or total")
+            return
+        stat, words = words[0], words[1:]
+        count = 10
+        if words and words[0].isdigit():
+            count, words = int(words[0]), words[1:]
+
+        table = self.client.get_stat_table()
+        self._print_rows(table.query(words, stat, count))
+
+    def complete_rank(self, text, line, begidx, endidx):
+        """Autocomplete stat names for rank"""
+        return [stat for stat in STAT_COLUMNS + ("total",) if stat.startswith(text.lower())]
+
+    def do_sync(self, args):
+        """Mirror resource families into the offline store: sync [pokemon|move|ability|machine|version-group|type ...] [refresh]
+Interrupted syncs resume where they stopped, 'refresh' revalidates every stored resource."""
+        words = args.lower().split()
+        refresh = "refresh" in words
+        families = [word for word in words if word != "refresh"] or list(SYNC_FAMILIES)
+        unknown = [family for family in families if family not in SYNC_FAMILIES]
+        if unknown:
+            print(f"Unknown resource families: {', '.join(unknown)}")
+            return
+
+        reports = self.client.sync(families, refresh)
+        pretty_print_dict(reports, "Sync")
+
+    def complete_sync(self, text, line, begidx, endidx):
+        """Autocomplete resource families for sync"""
+        return [family for family in SYNC_FAMILIES + ("refresh",) if family.startswith(text)]
+
     def do_moves(self, arg):
         """List all moves for a Pokemon: moves <pokemon>"""
         arg = arg.lower().strip()
@@ -125,19 +259,53 @@ class PokedexCommands(BaseCommands):
 
     def complete_moves(self, text, line, begidx, endidx):
         """Autocomplete Pokemon names for moves"""
-        text = text.lower().strip().split()
-        if not text[0]:
-            return list(self.client.pokemon_names)[:50]
-        for pokemon in text:
-            if not self._is_pokemon(pokemon):
-                names = [name for name in self.client.pokemon_names 
-                if name.startswith(pokemon.lower())]
-                if not names:
-                    return []
-                else:
-                    return names
+        return self._complete_pokemon(text)
+
+    def do_evolution(self, arg):
+        """Compare the stats of a Pokemon's whole evolution family: evolution <pokemon>"""
+        arg = arg.lower().strip()
+        if not arg:
+            print("Please provide a Pokemon name")
+            return
+
+        if not self._is_pokemon(arg):
+            print(f"Pokemon not found: {arg}")
+            return
+        self._print_evolution(arg)
+
+    def complete_evolution(self, text, line, begidx, endidx):
+        """Autocomplete Pokemon names for evolution"""
+        return self._complete_pokemon(text)
+
+    def do_learners(self, args):
+        """Pokemon that learn a move, optionally in one game version: learners <move> [version]"""
+        words = args.lower().split()
+        if not 0 < len(words) <= 2:
+            print("Please provide a move and optionally a version!")
+            return
+        move, version = words[0], words[1] if len(words) > 1 else None
+        if not self._check_name("move", move, "Move"):
+            return
+        if version and not self._check_name("version-group", version, "Version"):
+            return
+
+        learners = self.client.get_learners(move, version)
+        if not learners:
+            print(f"No Pokemon learn {move}{f' in {version}' if version else ''}")
+            return
+        if version:
+            # One line per way a Pokemon learns the move
+            rows = {}
+            for pokemon, _, method, level in learners:
+                rows.setdefault(pokemon, []).append(f"{method} {level}" if method == "level-up" else method)
+            pretty_print_list([f"{pokemon} ({', '.join(methods)})" for pokemon, methods in rows.items()], columns=3)
         else:
-            return []
+            pretty_print_list(list(dict.fromkeys(pokemon for pokemon, *_ in learners)))
+
+    def complete_learners(self, text, line, begidx, endidx):
+        """Autocomplete a move, then a version, for learners"""
+        resource = "move" if len(line[:begidx].split()) < 2 else "version-group"
+        return self._complete_name(resource, text)
 
     def do_ability(self, arg):
         """Get details for an ability: ability <ability>"""
@@ -146,8 +314,14 @@ class PokedexCommands(BaseCommands):
             print("Please provide an ability!")
             return
         
+        if not self._check_name("ability", arg, "Ability"):
+            return
         ability = self.client.get_ability(arg)
-        pretty_print_dict(ability, f"Ability: {pretty_string(ability)}")
+        pretty_print_dict(ability, f"Ability: {pretty_string(arg)}")
+
+    def complete_ability(self, text, line, begidx, endidx):
+        """Autocomplete ability names"""
+        return self._complete_name("ability", text)
 
     def do_stats(self, arg):
         """Get stats for a Pokemon: stats <pokemon>"""
@@ -161,16 +335,4 @@ class PokedexCommands(BaseCommands):
 
     def complete_stats(self, text, line, begidx, endidx):
         """Autocomplete Pokemon names for stats"""
-        text = text.lower().strip().split()
-        if not text[0]:
-            return list(self.client.pokemon_names)[:50]
-        for pokemon in text:
-            if not self._is_pokemon(pokemon):
-                names = [name for name in self.client.pokemon_names 
-                if name.startswith(pokemon.lower())]
-                if not names:
-                    return []
-                else:
-                    return names
-        else:
-            return []
\ No newline at end of file
+        return self._complete_pokemon(text)
\ No newline at end of file
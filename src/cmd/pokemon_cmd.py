@@ -1,4 +1,8 @@
 from src.misc.util import *
+from src.misc.moves import MoveIndex
+from src.misc.damage import MoveTable, damage_rolls, LEVEL
+from src.misc.stattable import StatTable
+from src.misc.parse import parse_stats, POKEMON_CONTEXT_FIELDS
 from src.cmd.base import BaseCommands
 
 class PokemonError(Exception):
@@ -7,21 +11,34 @@ class PokemonError(Exception):
         super().__init__(f"Pokemon error: {message}")
 
 class PokemonCommands(BaseCommands):
+    PREFETCH_MOVES = 20 # Moves prefetched when a version is chosen
+    DAMAGE_DEFENDERS = 6 # Named defenders get a column each, more are ranked like the roster
+
     def __init__(self, pokemon_name, pokemon_url, client):
         super().__init__()
         self.pokemon_name = pokemon_name
         self.pokemon_url = pokemon_url
         self.client = client
         print(f"Catching {pokemon_name}...")
-        self.pokemon = self.client.get_pokemon(pokemon_name)
-        self.stats = self.client.get_stats(pokemon_name)
+        pokemon = self.client.get_pokemon(pokemon_name, POKEMON_CONTEXT_FIELDS)
+        self.stats = parse_stats(pokemon)
+        # Only the move index and abilities are kept, the raw payload is released
+        self.moves = MoveIndex(pokemon["moves"])
+        self.abilities = pokemon["abilities"]
         self.available_versions = self._get_available_versions()
         self.version = None
+        # Fetch abilities while the user picks a version
+        self.client.cancel_prefetch()
+        self.client.prefetch([f"ability/{ability['ability']['name']}" for ability in self.abilities])
+
+    def postloop(self):
+        """Stop prefetching for this Pokemon once its context is left"""
+        self.client.cancel_prefetch()
 
     def precmd(self, line):
        """Override precmd so that version is set before anything else."""
        if self.version is None:
-           disallowed_commands = ['move', 'moves', 'abilities']
+           disallowed_commands = ['move', 'moves', 'abilities', 'damage']
            command = line.split()[0] if line.strip() else ''
            if command in disallowed_commands:
                pretty_message(f"""This command requires setting the game version first using the 'version' command.
@@ -32,12 +49,7 @@ class PokemonCommands(BaseCommands):
 
     def _get_available_versions(self):
         """Retrieve available versions based on the Pokémon's moves"""
-        version_groups = {
-            detail["version_group"]["name"]
-            for move in self.pokemon["moves"]
-            for detail in move["version_group_details"]
-        }
-        return list(self.client.versions.intersection(version_groups))
+        return list(self.client.versions.intersection(self.moves.versions))
 
     def complete_version(self, text, line, begidx, endidx):
         """Provide auto-completion for game versions."""
@@ -54,6 +66,9 @@ class PokemonCommands(BaseCommands):
             return
         print(f"Game version set to {arg}!")
         self.version = arg
+        # Level-up moves are the likeliest to be looked up next
+        self.client.cancel_prefetch()
+        self.client.prefetch([f"move/{name}" for name in self.moves.names(arg, "level-up")[:self.PREFETCH_MOVES]])
 
     def do_move(self, arg):
         """Get details about a move: 'move <move name>'"""
@@ -61,28 +76,23 @@ class PokemonCommands(BaseCommands):
             print("Please provide a move!")
             return
         arg = arg.strip().lower()
-        found_move = None
-        for move in self.pokemon["moves"]:
-            if move["move"]["name"] == arg:
-                for detail in move["version_group_details"]:
-                    if detail["version_group"]["name"] == self.version:
-                        found_move = move["move"]["name"]
-                        details = detail
-                        break
-                if found_move:
-                    break
-        if not found_move:
+        entry = self.moves.get(self.version, arg)
+        if not entry:
             print("Unknown move for this pokemon or game version!")
             return
-        move_build = self.client.get_usable_move(found_move)
-        move_build | {
-            "level_learned_at": details["level_learned_at"],
-            "move_learn_method": details["move_learn_method"]["name"]
+        move_build = self.client.get_usable_move(entry.name)
+        move_build |= {
+            "level_learned_at": entry.level,
+            "move_learn_method": entry.method
         }
-        pretty_print_dict(move_build, found_move)
+        pretty_print_dict(move_build, entry.name)
 
     def complete_move(self, text, line, begidx, endidx):
-        return [move["move"]["name"] for move in self.pokemon["moves"] if move["move"]["name"].startswith(text)]
+        """Autocomplete move names for the chosen version"""
+        names = self.moves.names(self.version) if self.version else {
+            name for entries in self.moves.by_version.values() for name in entries
+        }
+        return sorted(name for name in names if name.startswith(text))
 
     def do_moves(self, arg):
         """\nList all moves for the chosen Pokemon: 'moves'
@@ -105,14 +115,7 @@ Use 'moves egg' to list egg moves\n"""
             return
 
         method = move_flags[arg]
-        moves = []
-        for move in self.pokemon["moves"]:
-            # Lengthy way to check if the move is available in the chosen version
-            for move_details in move["version_group_details"]:
-                if (method is None or move_details["move_learn_method"]["name"] == method) and \
-                    move_details["version_group"]["name"] == self.version: # Verify version
-                    moves.append(move["move"]["name"]) # Append the move name
-                    break  # Continue once a match is found
+        moves = self.moves.names(self.version, method)
 
         if moves:
             print(f"Moves for {pretty_string(self.pokemon_name)} in {self.version}{f' with method {method}' if method else ''}:")
@@ -127,19 +130,27 @@ Use 'moves egg' to list egg moves\n"""
             return
         pretty_print_dict(self.stats, f"{self.pokemon_name} Stats")
 
+    def do_evolution(self, arg):
+        """Compare the stats of the chosen Pokemon's evolution family"""
+        if arg.strip():
+            print(f"This command does not accept arguments.")
+            return
+        self._print_evolution(self.pokemon_name)
+
     def do_abilities(self, arg):
         """List the abilities for chosen pokemon of chosen game version"""
         if arg.strip():
             print(f"This command does not accept arguments.")
             return
-        abilities = self.pokemon["abilities"]
+        abilities = self.abilities
         totals = {}
+        # Fetch the abilities not seen yet in one concurrent wave
+        all_effects = self.client.get_abilities_many([ability["ability"]["name"] for ability in abilities])
 
-        for ability in abilities:
+        for ability, effects in zip(abilities, all_effects):
             name = ability["ability"]["name"]
             num = ability["slot"]
             hidden = ability["is_hidden"]
-            effects = self.client.get_ability(name)
             if not (desc := effects.get(self.version, None)):
                 print("No abilities found! Try changing game version.")
                 return
@@ -149,4 +160,82 @@ Use 'moves egg' to list egg moves\n"""
                 "Effect": desc
             }
 
-        pretty_print_dict(totals, f"{self.pokemon_name} Abilities")
\ No newline at end of file
+        pretty_print_dict(totals, f"{self.pokemon_name} Abilities")
+
+    def do_damage(self, arg):
+        """\nDamage of the chosen Pokemon's moves in the chosen version, as % of the defender's HP:
+Use 'damage <pokemon> ...' for each move's damage range against up to six Pokemon
+Use 'damage all [conditions...]' to rank moves against every Pokemon, or those matching conditions like type=water
+Options: 'limit <n>' moves to show (default 10), 'level <n>' for both sides (default 50)
+Moves use the power, type and physical/special split of the chosen version, stats assume
+31 IVs, no EVs and neutral natures, and the type chart is the current one\n"""
+        words = arg.lower().split()
+        options = {"limit": "10", "level": str(LEVEL)}
+        for option in options:
+            if option in words:
+                i = words.index(option)
+                if i + 1 >= len(words) or not words[i + 1].isdigit():
+                    print(f"Please provide a number for {option}!")
+                    return
+                options[option] = words[i + 1]
+                del words[i:i + 2]
+        limit, level = int(options["limit"]), int(options["level"])
+        if not 1 <= level <= 100:
+            print("Level must be between 1 and 100!")
+            return
+
+        names = list(dict.fromkeys(word for word in words if word in self.client.pokemon_names))
+        conditions = [word for word in words if word not in self.client.pokemon_names and word != "all"]
+        if not (names or "all" in words or conditions):
+            print("Please provide defending Pokemon, or 'all'!")
+            return
+        if names and conditions:
+            print(f"Unknown Pokemon: {', '.join(conditions)}")
+            return
+
+        # Move data is one concurrent wave, kept for the session
+        move_names = self.moves.names(self.version)
+        moves = MoveTable(dict(zip(move_names, self.client.get_damage_moves(move_names, self.version))))
+        if not len(moves):
+            print("No damaging moves found! Check version.")
+            return
+        attacker = StatTable.from_stats({self.pokemon_name: self.stats})
+        if names:
+            defenders = StatTable.from_stats(dict(zip(names, self.client.get_stats_many(names))))
+        else:
+            table = self.client.get_stat_table()
+            defenders = table.take(table.query(conditions))
+            if not len(defenders):
+                print("No Pokemon match!")
+                return
+
+        rolls, hp = damage_rolls(attacker, moves, defenders, self.client.get_type_chart(), level)
+        # Rolls are sorted, so the lowest and highest are the first and last
+        low, high = rolls[:, :, 0], rolls[:, :, -1]
+        title = f"{self.pokemon_name} Damage (% HP)"
+        if len(names) and len(names) <= self.DAMAGE_DEFENDERS:
+            low, high = low * 100 / hp, high * 100 / hp
+            # Strongest against any defender first
+            order = high.max(axis=1).argsort(kind="stable")[::-1][:limit]
+            pretty_compare({
+                name: {moves.names[m]: f"{low[m, d]:.1f}-{high[m, d]:.1f}" for m in order}
+                for d, name in enumerate(defenders.names)
+            }, title)
+            return
+
+        # Average roll per defender, then over the defenders
+        average = (rolls.mean(axis=2) * 100 / hp).mean(axis=1)
+        order = average.argsort(kind="stable")[::-1][:limit]
+        pretty_compare({
+            moves.names[m]: {
+                "Average": round(float(average[m]), 1),
+                "Min": round(float((low[m] * 100 / hp).min()), 1),
+                "Max": round(float((high[m] * 100 / hp).max()), 1),
+                "Sure OHKOs": int((low[m] >= hp).sum()),
+                "Possible OHKOs": int((high[m] >= hp).sum())
+            } for m in order
+        }, f"{title} vs {len(defenders)} Pokemon")
+
+    def complete_damage(self, text, line, begidx, endidx):
+        """Autocomplete defending Pokemon names"""
+        return self.client.pokemon_index.complete(text.lower().strip())
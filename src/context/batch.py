@@ -0,0 +1,112 @@
+import io
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from src.cmd.pokedex_cmd import PokedexCommands
+from src.cmd.pokemon_cmd import PokemonCommands
+from src.misc.util import capture_output, pretty_error, ThreadStdout
+
+def parse_jobs(lines):
+    """Group script lines into independent jobs.
+    'choose <pokemon>' starts a sequential job that runs until 'exit'."""
+    jobs = []
+    context = None
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if context is not None:
+            context.append(line)
+            if line == "exit":
+                context = None
+            continue
+        job = [line]
+        jobs.append(job)
+        if line.split()[0] == "choose":
+            context = job
+    return jobs
+
+class BatchRunner:
+    """Runs Pokedex commands without prompts and writes one NDJSON record per command"""
+
+    def __init__(self, client, jobs=4, out=None):
+        self.client = client
+        self.jobs = jobs
+        self.out = out or sys.stdout
+
+    def run(self, lines):
+        """Run every job, independent jobs in parallel, records stream out in input order"""
+        stdout = ThreadStdout(sys.stdout)
+        sys.stdout = stdout
+        try:
+            # A pool separate from the client's so jobs never wait on their own workers
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                for records in executor.map(lambda job: self._run_job(job, stdout), parse_jobs(lines)):
+                    for record in records:
+                        self.out.write(json.dumps(record, default=str) + "\n")
+                    self.out.flush()
+        finally:
+            sys.stdout = stdout.stream
+
+    def _run_job(self, job, stdout):
+        records = []
+        commands = PokedexCommands(self.client)
+        for i, line in enumerate(job):
+            if isinstance(commands, PokemonCommands):
+                if line == "exit":
+                    records.append(self._run_line(line, stdout, commands.postloop))
+                    break
+                records.append(self._run_line(line, stdout, lambda: self._run_in_context(commands, line)))
+            elif line.split()[0] == "choose":
+                # Enter the Pokemon context without starting its command loop
+                def choose():
+                    nonlocal commands
+                    name = line.split(maxsplit=1)[1].strip().lower() if len(line.split()) > 1 else ""
+                    if not commands._is_pokemon(name):
+                        pretty_error(f"Pokemon not found: {name}")
+                        return
+                    commands = PokemonCommands(name, self.client.pokemon_dict[name], self.client)
+                records.append(self._run_line(line, stdout, choose))
+                if not isinstance(commands, PokemonCommands):
+                    # The context's commands cannot run, each still gets a record
+                    skipped = [{"type": "error", "title": "", "data": f"Skipped, '{line}' failed"}]
+                    records.extend(self._record(rest, skipped, "") for rest in job[i + 1:])
+                    break
+            else:
+                records.append(self._run_line(line, stdout, lambda: commands.onecmd(line)))
+        return records
+
+    @staticmethod
+    def _run_in_context(commands, line):
+        """Run a line in a Pokemon context, returns False when precmd refused it"""
+        line = commands.precmd(line)
+        if not line:
+            return False
+        commands.onecmd(line)
+
+    def _run_line(self, line, stdout, run):
+        stdout.local.buffer = io.StringIO()
+        try:
+            with capture_output() as results:
+                try:
+                    refused = run() is False
+                except Exception as e:
+                    refused = False
+                    results.append({"type": "error", "title": "", "data": f"{type(e).__name__}: {e}"})
+        finally:
+            text = stdout.local.buffer.getvalue()
+            stdout.local.buffer = None
+        if refused:
+            # The message explaining a refusal is the command's error
+            results = [result | {"type": "error"} if result["type"] == "message" else result for result in results]
+        return self._record(line, results, text)
+
+    @staticmethod
+    def _record(line, results, text):
+        return {
+            "command": line,
+            "ok": not any(result["type"] == "error" for result in results),
+            "results": [result for result in results if result["type"] != "error"],
+            "errors": [result["data"] for result in results if result["type"] == "error"],
+            "output": text.strip()
+        }
@@ -0,0 +1,99 @@
+import asyncio
+import weakref
+from src.misc.cache import cache_key
+from src.misc.parse import *
+
+class _LoopState:
+    """Per event loop concurrency limit and in-flight requests"""
+    __slots__ = ("semaphore", "in_flight")
+
+    def __init__(self, max_concurrency):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = {}
+
+# Asyncio PokeAPI client
+class AsyncPokeApiClient:
+    """Asyncio front end to a PokeApiClient.
+
+    Requests run on the client's worker pool so they share its keep-alive
+    session, response cache and SSL settings. At most max_concurrency requests
+    are in flight per event loop, and identical in-flight requests of a loop
+    wait on one task instead of taking a worker each; across loops and threads
+    the client's single flight shares the fetch. Coalesced results are shared,
+    treat them as read-only.
+    """
+
+    def __init__(self, client, max_concurrency=8):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._states = weakref.WeakKeyDictionary()
+
+    def _state(self):
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState(self.max_concurrency)
+        return state
+
+    async def _make_request(self, endpoint, params=None, fields=None):
+        state = self._state()
+        key = (cache_key(endpoint, params), fields)
+        task = state.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(state, endpoint, params, fields))
+            state.in_flight[key] = task
+            task.add_done_callback(lambda _: state.in_flight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, state, endpoint, params, fields):
+        request = (endpoint, params, fields)
+        async with state.semaphore:
+            if not self.client._prompts_allowed():
+                # Running on a worker thread, handing off to the pool could deadlock it
+                return self.client._quiet_request(request)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.client.executor, self.client.metrics.bind(self.client._quiet_request), request)
+
+    async def gather(self, aws):
+        """Await a batch of coroutines concurrently, results keep the input order"""
+        return list(await asyncio.gather(*aws))
+
+    # Pokemon endpoints
+    async def get_pokemon(self, name_or_id, fields=None):
+        return await self._make_request(f"pokemon/{name_or_id}", fields=fields)
+
+    async def get_pokemon_list(self, limit=20, offset=0):
+        return await self._make_request("pokemon", params={"limit": limit, "offset": offset})
+
+    async def get_berry(self, name_or_id):
+        return await self._make_request(f"berry/{name_or_id}")
+
+    async def get_item(self, name_or_id):
+        return await self._make_request(f"item/{name_or_id}")
+
+    async def get_versions(self):
+        return await self._make_request("version-group?limit=100")
+
+    async def get_move(self, name_or_id):
+        return await self._make_request(f"move/{name_or_id}")
+
+    async def get_usable_move(self, name_or_id):
+        move = parse_move(await self.get_move(name_or_id))
+        if move["machines"]:
+            machines = await self.gather(
+                self._make_request(f"machine/{id}", fields=MACHINE_FIELDS) for id in machine_ids(move["machines"])
+            )
+            move["machines"] = parse_machines(machines)
+        else:
+            move["machines"] = None
+        return move
+
+    async def get_machine(self, id):
+        return await self._make_request(f"machine/{id}")
+
+    async def get_stats(self, id):
+        return parse_stats(await self.get_pokemon(id, STATS_FIELDS))
+
+    async def get_ability(self, id):
+        return parse_ability(await self._make_request(f"ability/{id}", fields=ABILITY_FIELDS))
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+from src.misc.lazy import LazyModule
+
+sqlite3 = LazyModule("sqlite3")
+
+DAY = 24 * 60 * 60
+
+# Time to live (seconds) per endpoint family. PokeAPI data barely changes.
+DEFAULT_TTLS = {
+    "pokemon": 30 * DAY,
+    "move": 30 * DAY,
+    "ability": 30 * DAY,
+    "machine": 90 * DAY,
+    "version-group": 7 * DAY,
+}
+DEFAULT_TTL = 7 * DAY
+LIST_TTL = 1 * DAY  # Paginated lists grow when new Pokemon are added
+
+def default_cache_dir():
+    """Return the directory used for Pokedex CLI data files"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pokedex_cli")
+
+def cache_key(url, params=None):
+    """Build a stable cache key from a url and its query parameters"""
+    if not params:
+        return url
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}{urlencode(sorted(params.items()))}"
+
+class CacheEntry:
+    """A cached response body and its revalidation headers"""
+    __slots__ = ("body", "etag", "last_modified", "expires")
+
+    def __init__(self, body, etag, last_modified, expires):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+    @property
+    def fresh(self):
+        return self.expires > time.time()
+
+    def validators(self):
+        """Conditional request headers for revalidating a stale entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class MemoryCache:
+    """Small thread-safe LRU of raw response bodies kept in memory"""
+
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._items[key] = body
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+class ResponseCache:
+    """Persistent SQLite cache of raw API responses with TTLs and LRU eviction"""
+
+    def __init__(self, path=None, max_bytes=256 * 1024 * 1024, ttls=None):
+        if path is None:
+            os.makedirs(default_cache_dir(), exist_ok=True)
+            path = os.path.join(default_cache_dir(), "responses.sqlite3")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = DEFAULT_TTLS | (ttls or {})
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    expires REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl_for(self, endpoint, params=None):
+        """Return the time to live for an endpoint, lists expire sooner"""
+        path, _, query = endpoint.strip("/").partition("?")
+        segments = path.split("/")
+        if params or query or len(segments) < 2:
+            return LIST_TTL
+        return self.ttls.get(segments[0], DEFAULT_TTL)
+
+    def get(self, key):
+        """Return the CacheEntry for a key, fresh or stale, or None"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+        return CacheEntry(*row)
+
+    def put(self, key, body, ttl, etag=None, last_modified=None):
+        """Store a response body, evicting least recently used entries past the size cap"""
+        now = time.time()
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, etag, last_modified, now + ttl, now, len(body))
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def touch(self, key, ttl):
+        """Extend the lifetime of an entry after a 304 Not Modified"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE responses SET expires = ?, accessed = ? WHERE key = ?", (now + ttl, now, key)
+            )
+
+    def items(self):
+        """Yield (key, body) for every cached response"""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, body FROM responses").fetchall()
+        yield from rows
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def _evict(self):
+        """Drop least recently used rows until the cache is 90% of its cap"""
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        for key, size in rows:
+            if self._size <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._size -= size
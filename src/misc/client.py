@@ -1,7 +1,28 @@
-import requests
-from urllib3.exceptions import InsecureRequestWarning
-from urllib3 import disable_warnings
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from src.misc.lazy import LazyModule
 from src.misc.util import *
+from src.misc.cache import ResponseCache, MemoryCache, cache_key
+from src.misc.snapshot import load_snapshot, save_snapshot
+from src.misc.parse import *
+from src.misc.completion import CompletionIndex
+from src.misc.prefetch import Prefetcher
+from src.misc.metrics import Metrics
+from src.misc.typechart import TypeChart, TYPE_NAMES
+from src.misc.stattable import StatTable
+from src.misc.learners import LearnerIndex
+from src.misc.sync import Syncer, SYNC_FAMILIES
+from src.misc.ratelimit import RateLimiter, retry_after_seconds
+from src.misc.damage import move_in_version
+from src.misc.retry import RetryPolicy, CircuitBreaker
+
+# Imported on first use so the prompt can appear before they load
+asyncio = LazyModule("asyncio")
+sqlite3 = LazyModule("sqlite3")
+requests = LazyModule("requests")
+urllib3 = LazyModule("urllib3")
 
 class PokeApiError(Exception):
     """Exception raised for errors in the PokeAPI."""
@@ -9,34 +30,190 @@ class PokeApiError(Exception):
         super().__init__(f"API error: {message}")
 
 # Retry wrapper for PokeAPI requests
-def poke_api_retry(func):
-    """Wrapper to handle PokeAPI retries"""
-    def wrapper(*args, **kwargs):
+def poke_api_retry(func=None, *, automatic=True):
+    """Wrapper to handle PokeAPI retries.
+    Retryable errors are retried with the client's backoff policy, unless the circuit
+    breaker is open. Once retries run out the user is asked only when retry_prompt is on.
+    Wrappers around whole waves pass automatic=False, their requests retry on their own."""
+    if func is None:
+        return lambda func: poke_api_retry(func, automatic=automatic)
+
+    def wrapper(self, *args, **kwargs):
+        attempt = 0
         while True:
             try:
-                return func(*args, **kwargs)
+                return func(self, *args, **kwargs)
             except requests.RequestException as e:
+                policy = self.retry_policy
+                if (automatic and attempt < policy.max_retries and policy.retryable(e)
+                        and not self.breaker.open):
+                    attempt += 1
+                    self.metrics.event("retries")
+                    time.sleep(policy.delay(attempt, retry_after_seconds(e.response)))
+                    continue
+                if not (self.retry_prompt and self._prompts_allowed()):
+                    raise e
                 choice = input(f"{str(e)} - Retry API request? (y/n): ")
                 if choice.lower().strip() != "y":
                     raise e
+                attempt = 0
+                self.metrics.event("retries")
     return wrapper
 
 # PokeAPI client
 class PokeApiClient:
-    def __init__(self, base_url="https://pokeapi.co/api/v2"):
+    BASE_URL = "https://pokeapi.co/api/v2"
+
+    def __init__(self, base_url=BASE_URL, use_cache=True, max_workers=8, store=None,
+                 interactive=True, verify_ssl=True, session=None, trace=None, retry_prompt=False,
+                 retry_policy=None, rate=50.0, timeout=30):
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
-        self.verify_ssl = True
-        self.ssl_warnings_suppressed = False
+        # A caller supplied session can mount its own transport for a url prefix
+        self._session = session
+        self._session_ready = False
+        self._init_lock = threading.Lock()
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.verify_ssl = verify_ssl
+        self.ssl_warnings_suppressed = not verify_ssl
+        self.interactive = interactive  # Prompt on SSL errors
+        self.retry_prompt = retry_prompt  # Ask before giving up on a failed request
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.limiter = RateLimiter(rate, max_rate=rate * 2)  # Shared by every request, sync included
+        self.breaker = CircuitBreaker()
+        self.timeout = timeout
+        self._local = threading.local()
+        self.metrics = Metrics()
+        if trace:
+            self.metrics.trace_to(trace)
+        self.refresh_thread = None  # Background snapshot refresh, if one was started
+        self._stats = {}  # Pokemon name or id: parsed stats
+        self._abilities = {}  # Ability name or id: {version group: English text}
+        self._damage_moves = {}  # Move name: power, type, damage class and past values
+        self._version_orders = {}  # Version group: (generation, id)
+        self._chains = {}  # Evolution chain id: resolved stages
+        self._chain_ids = {}  # Pokemon or species name: evolution chain id
+        self._type_chart = None
+        self._stat_table = None
+        self.store = store  # LocalStore serving every request offline
+        self.use_cache = use_cache and store is None
+        self._cache = None
+        self.memory = MemoryCache()  # Decoded-on-read response bodies for this session
+        self._flights = {}  # Cache key: Future of the body being fetched, shared by concurrent callers
+        self._flights_lock = threading.Lock()
+        self.prefetcher = Prefetcher(self)
+        self._aio = None
+        self._learners = None
+        self._names = {}  # Resource family: every name, loaded with the snapshot or on first use
+        self._name_indexes = {}  # Resource family: CompletionIndex
+        self._load_index()
+
+    @property
+    def session(self):
+        """Pooled requests session, created on first use"""
+        if not self._session_ready:
+            with self._init_lock:
+                if not self._session_ready:
+                    session = self._session or requests.Session()
+                    session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=self.max_workers))
+                    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=self.max_workers))
+                    self._session = session
+                    self._session_ready = True
+        return self._session
+
+    @property
+    def cache(self):
+        """Persistent response cache, opened on first use, None when disabled"""
+        if self._cache is None and self.use_cache:
+            with self._init_lock:
+                if self._cache is None and self.use_cache:
+                    self._cache = self._open_cache()
+                    self.use_cache = self._cache is not None
+        return self._cache
+
+    @property
+    def aio(self):
+        """Asyncio companion client sharing this client's session, caches and workers"""
+        if self._aio is None:
+            from src.misc.async_client import AsyncPokeApiClient
+            self._aio = AsyncPokeApiClient(self, max_concurrency=self.max_workers)
+        return self._aio
+
+    @property
+    def learners(self):
+        """Reverse move index, persisted next to the response cache when caching is on"""
+        if self._learners is None:
+            with self._init_lock:
+                if self._learners is None:
+                    try:
+                        self._learners = LearnerIndex(self.base_url, None if self.use_cache else ":memory:")
+                    except (OSError, sqlite3.Error) as e:
+                        print(f"Learner index unavailable on disk: {e}")
+                        self._learners = LearnerIndex(self.base_url, ":memory:")
+        return self._learners
+
+    def _load_index(self):
+        """Load the Pokemon and version index, from the on-disk snapshot when possible"""
+        snapshot = load_snapshot(self.base_url) if self.use_cache else None
+        if snapshot:
+            self._set_pokemon(snapshot["pokemon"])
+            self.versions = set(snapshot["versions"])
+            self._names = dict(snapshot.get("names", {}))
+            self.refresh_thread = threading.Thread(target=self._refresh_index, daemon=True)
+            self.refresh_thread.start()
+            return
         self._load_pokemon()
         self._load_versions()
+        self._save_index()
+
+    def _save_index(self):
+        """Write the current index to the snapshot file"""
+        if not self.use_cache:
+            return
+        try:
+            save_snapshot(self.base_url, {
+                "pokemon": self.pokemon_dict,
+                "versions": sorted(self.versions),
+                "names": self._names
+            })
+        except OSError as e:
+            print(f"Failed to save Pokemon index: {e}")
 
-    def _load_pokemon(self):
+    def _refresh_index(self):
+        """Background refresh of the snapshot when PokeAPI's counts have changed"""
+        try:
+            with self._quiet(), self.metrics.label("refresh"):
+                changed = False
+                if self.get_pokemon_list(1, 0)["count"] != len(self.pokemon_dict):
+                    self._load_pokemon(verbose=False)
+                    changed = True
+                versions = {version["name"] for version in self.get_versions()["results"]}
+                if versions and versions != self.versions:
+                    self.versions = versions
+                    self._name_indexes.pop("version-group", None)
+                    changed = True
+                for resource, names in list(self._names.items()):
+                    if self._make_request(resource, params={"limit": 1, "offset": 0})["count"] != len(names):
+                        self._names[resource] = self._load_names(resource)
+                        self._name_indexes.pop(resource, None)
+                        changed = True
+                if changed:
+                    self._save_index()
+        except (requests.RequestException, PokeApiError, KeyError):
+            pass  # Keep serving the snapshot, try again next launch
+
+    def _load_pokemon(self, verbose=True):
         """Initial load of all Pokemon names from the API"""
-        self.pokemon_dict = self.get_initial_pokemon()
-        if not self.pokemon_dict:
+        pokemon_dict = self.get_initial_pokemon(verbose)
+        if not pokemon_dict:
             raise PokeApiError("Failed to load Pokemon from PokeAPI")
-        self.pokemon_names = set(self.pokemon_dict.keys())
+        self._set_pokemon(pokemon_dict)
+
+    def _set_pokemon(self, pokemon_dict):
+        """Install a {name: url} dict along with its name set and completion index"""
+        self.pokemon_dict = pokemon_dict
+        self.pokemon_names = set(pokemon_dict.keys())
+        self.pokemon_index = CompletionIndex(self.pokemon_names)
 
     def _load_versions(self):
         """Initial load of all available versions from the API"""
@@ -45,48 +222,175 @@ class PokeApiClient:
         if not self.versions:
             raise PokeApiError("Failed to load versions from PokeAPI")
 
+    def _open_cache(self):
+        """Open the persistent response cache, running uncached if it is unavailable"""
+        try:
+            return ResponseCache()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Response cache unavailable: {e}")
+            return None
+
+    @contextmanager
+    def _quiet(self):
+        """Disable interactive prompts for requests made on this thread"""
+        previous = getattr(self._local, "quiet", False)
+        self._local.quiet = True
+        try:
+            yield
+        finally:
+            self._local.quiet = previous
+
+    def _prompts_allowed(self):
+        return not getattr(self._local, "quiet", False)
+
     def _handle_ssl_error(self):
         """Handle SSL errors dynamically"""
         if not self.verify_ssl:
             return  # SSL verification already disabled
+        if not self.interactive or not self._prompts_allowed():
+            raise requests.exceptions.SSLError("SSL verification failed.")
         print("-"*50)
         while True:
             choice = input("SSL verification failed. Disable SSL verification for all future requests? (y/n): ").lower().strip()
             if choice == "y":
                 self.verify_ssl = False
                 self.ssl_warnings_suppressed = True
+                self.metrics.event("ssl_fallbacks")
                 print("SSL verification disabled for all future requests.")
                 print("-"*50)
                 break
             elif choice == "n":
                 print("-"*50)
-                raise requests.RequestException("SSL verification is required but failed.")
+                raise requests.exceptions.SSLError("SSL verification is required but failed.")
             else:
                 print("Invalid choice.")
 
     def _suppress_ssl_warnings(self):
         """Suppress SSL warnings if warnings are disabled"""
         if self.ssl_warnings_suppressed:
-            disable_warnings(InsecureRequestWarning)
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     @poke_api_retry
-    def _make_request(self, endpoint, params=None):
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        self._suppress_ssl_warnings()  # Suppress warnings if needed
+    def _make_request(self, endpoint, params=None, fields=None, cache=True):
+        """Fetch an endpoint through the caches, fields limits the decoded payload to those keys.
+        cache=False keeps a bulk fetch's responses out of the caches, which are still read."""
+        with self.metrics.request(endpoint, params) as record:
+            if self.store is not None:
+                record.source = "offline"
+                return project(self.store.get(endpoint, params), fields)
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
+            key = cache_key(url, params)
+            body = self.memory.get(key)
+            if body is not None:
+                record.source, record.size = "memory", len(body)
+                return decode_json(body, fields)
+            entry = self.cache.get(key) if self.cache else None
+            if entry and entry.fresh:
+                record.source, record.size = "disk", len(entry.body)
+                self.memory.put(key, entry.body)
+                return decode_json(entry.body, fields)
+
+            # Single flight: one fetch per key, whichever thread, wave or prefetch asks first
+            with self._flights_lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = Future()
+            if not leader:
+                body = flight.result()  # Raises the leader's error
+                record.source, record.size = "shared", len(body)
+                return decode_json(body, fields)
+            try:
+                body = self._fetch(url, key, endpoint, params, entry, cache, record)
+                flight.set_result(body)
+            except BaseException as e:
+                flight.set_exception(e)
+                raise
+            finally:
+                with self._flights_lock:
+                    del self._flights[key]
+            # PokeAPI serves UTF-8 JSON, skip charset detection and decode the bytes directly
+            return decode_json(body, fields)
+
+    def _fetch(self, url, key, endpoint, params, entry, cache, record):
+        """Network side of _make_request, returns the body after storing it in the caches"""
+        while True:
+            self._suppress_ssl_warnings()  # Suppress warnings if needed
+            try:
+                headers = entry.validators() if entry else None
+                response = self._send(url, params, headers)
+                if entry and response.status_code == 304: # Stale entry is still valid
+                    record.source, record.size = "revalidated", len(entry.body)
+                    self.cache.touch(key, self.cache.ttl_for(endpoint, params))
+                    self.memory.put(key, entry.body)
+                    return entry.body
+                response.raise_for_status()
+                record.source, record.size = "network", len(response.content)
+                if cache:
+                    self.memory.put(key, response.content)
+                    if self.cache:
+                        self.cache.put(
+                            key, response.content, self.cache.ttl_for(endpoint, params),
+                            response.headers.get("ETag"), response.headers.get("Last-Modified")
+                        )
+                return response.content
+            except requests.exceptions.SSLError as e:
+                print(f"SSL Error: {e}")
+                self._handle_ssl_error()
+                record.source = "ssl-retry"  # Retry with updated SSL
 
+    def _send(self, url, params=None, headers=None):
+        """One GET through the circuit breaker and the shared rate limiter.
+        Throttling slows every caller down, failures count towards opening the breaker."""
+        if not self.breaker.allow():
+            raise requests.ConnectionError(
+                f"PokeAPI looks unavailable, requests are paused for {self.breaker.remaining():.0f}s"
+            )
+        self.limiter.acquire()
         try:
-            response = self.session.get(url, params=params, verify=self.verify_ssl)
-            response.raise_for_status()
-            response.encoding = response.apparent_encoding
-            return response.json()
-        except requests.exceptions.SSLError as e:
-            print(f"SSL Error: {e}")
-            self._handle_ssl_error()
-            return self._make_request(endpoint, params)  # Retry with updated SSL
+            response = self.session.get(url, params=params, headers=headers, verify=self.verify_ssl, timeout=self.timeout)
+        except requests.exceptions.SSLError:
+            raise  # A certificate problem says nothing about PokeAPI's health
+        except (requests.ConnectionError, requests.Timeout):
+            self.breaker.failure()
+            self.limiter.throttled()
+            raise
+        if response.status_code == 429:
+            self.limiter.throttled(retry_after_seconds(response))
+        elif response.status_code >= 500:
+            self.breaker.failure()
+            self.limiter.throttled(retry_after_seconds(response))
+        else:
+            self.breaker.success()
+            self.limiter.success()
+        return response
+
+    def _in_memory(self, endpoint, params=None):
+        """Whether a request would be answered from the in-memory cache"""
+        return cache_key(f"{self.base_url}/{endpoint.lstrip('/')}", params) in self.memory
+
+    def _quiet_request(self, request):
+        """Worker side of _fetch_many, prompts are left to the calling thread.
+        Requests are endpoints or (endpoint, params[, fields[, cache]]) tuples."""
+        request = request if isinstance(request, tuple) else (request,)
+        with self._quiet():
+            return self._make_request(*request)
+
+    @poke_api_retry(automatic=False)
+    def _fetch_many(self, requests_list):
+        """Fetch several endpoints concurrently, results keep the input order.
+        Items are endpoints or (endpoint, params) tuples."""
+        if not self._prompts_allowed():
+            # Already on a worker thread, waiting on the pool here could deadlock it
+            return [self._quiet_request(request) for request in requests_list]
+        return list(self.executor.map(self.metrics.bind(self._quiet_request), requests_list))
 
     # Pokemon endpoints
-    def get_pokemon(self, name_or_id):
-        return self._make_request(f"pokemon/{name_or_id}")
+    def get_pokemon(self, name_or_id, fields=None):
+        pokemon = self._make_request(f"pokemon/{name_or_id}", fields=fields)
+        if "moves" in pokemon and name_or_id in self.pokemon_names:
+            self.learners.add(name_or_id, pokemon["moves"])
+        return pokemon
     
     # Pokemon list endpoint
     def get_pokemon_list(self, limit= 20, offset= 0):
@@ -100,34 +404,57 @@ class PokeApiClient:
     def get_item(self, name_or_id):
         return self._make_request(f"item/{name_or_id}")
     
+    def _iter_list(self, resource, chunk_size=100):
+        """Yield every page of a list endpoint, pages after the first are fetched concurrently"""
+        first_page = self._make_request(resource, params={"limit": chunk_size, "offset": 0})
+        yield first_page
+        yield from self._fetch_many([
+            (resource, {"limit": chunk_size, "offset": offset})
+            for offset in range(chunk_size, first_page["count"], chunk_size)
+        ])
+
     # Generator to fetch Pokemon data in chunks
-    def _get_pokemon_iterator(self, chunk_size = 100):
-        """Generator to fetch Pokemon data in chunks"""
-        print("Catching Pokemon...")
+    def _get_pokemon_iterator(self, chunk_size = 100, verbose=True):
+        """Generator to fetch Pokemon data in chunks, pages after the first are fetched concurrently"""
+        if verbose:
+            print("Catching Pokemon...")
         total = 0
-        offset = 0
-        while True:
-            response = self.get_pokemon_list(chunk_size, offset)
-            
-            chunk_data = response["results"]
-            if not chunk_data: # Caught all pokemon
-                break
-                
-            for pokemon in chunk_data:
+        for response in self._iter_list("pokemon", chunk_size):
+            for pokemon in response["results"]:
                 yield pokemon
                 total += 1
-            offset += chunk_size
-            print(f"Caught {total} Pokemon...")
-        print("Caught em all!")
+            if verbose:
+                print(f"Caught {total} Pokemon...")
+        if verbose:
+            print("Caught em all!")
 
     # Create a dictionary of {Pokemon: url}
-    def get_initial_pokemon(self):
+    def get_initial_pokemon(self, verbose=True):
         """Create a dictionary of Pokemon names for quick lookup"""
         return {
             pokemon["name"]: pokemon["url"] 
-            for pokemon in self._get_pokemon_iterator()
+            for pokemon in self._get_pokemon_iterator(verbose=verbose)
         }
     
+    # Name indexes
+    def names(self, resource):
+        """CompletionIndex of every name in 'move', 'ability' or 'version-group'.
+        Names come from the snapshot, or are fetched in parallel pages on first use and saved."""
+        index = self._name_indexes.get(resource)
+        if index is None:
+            if resource == "version-group":
+                names = self.versions
+            else:
+                names = self._names.get(resource)
+                if names is None:
+                    names = self._names[resource] = self._load_names(resource)
+                    self._save_index()
+            index = self._name_indexes[resource] = CompletionIndex(names)
+        return index
+
+    def _load_names(self, resource):
+        return [entry["name"] for page in self._iter_list(resource) for entry in page["results"]]
+
     # Get a list of available versions
     def get_versions(self):
         return self._make_request("version-group?limit=100")
@@ -136,80 +463,217 @@ class PokeApiClient:
         return self._make_request(f"move/{name_or_id}")
 
     def get_usable_move(self, name_or_id):
-        move = self.get_move(name_or_id)
-        move["damage_class"] = move["damage_class"]["name"]
-        move["effects"] = [effect["short_effect"] for effect in move["effect_entries"]]
-        keys_to_del = [
-            "contest_combos",
-            "contest_effect",
-            "contest_type",
-            "effect_changes",
-            "effect_entries",
-            "flavor_text_entries",
-            "generation",
-            "id",
-            "learned_by_pokemon",
-            "meta",
-            "name",
-            "names",
-            "past_values",
-            "stat_changes",
-            "super_contest_effect",
-            "target",
-            "type"
-        ]
-        for key in keys_to_del:
-            move.pop(key, None)
-        if move["effect_chance"] is None:
-            move.pop("effect_chance", None)
+        move = parse_move(self.get_move(name_or_id))
         move["machines"] = self._prettify_machines(move["machines"])
         return move
     
+    def get_damage_moves(self, names, version=None):
+        """Power, type and damage class of many moves in one concurrent wave, results keep the input order.
+        Only that projection is fetched and it is kept for the session. With a version group the
+        values are those the moves had in it, from their past values."""
+        moves = self._memoized(self._damage_moves, names, lambda missing: [
+            parse_damage_move(move)
+            for move in self._fetch_many([(f"move/{name}", None, DAMAGE_MOVE_FIELDS) for name in missing])
+        ])
+        if version is None:
+            return [dict(move) for move in moves]
+        groups = [version] + sorted({group for move in moves for group, *_ in move["past"]})
+        orders = dict(zip(groups, self.get_version_orders(groups)))
+        return [move_in_version(move, orders[version], orders) for move in moves]
+
+    def get_version_orders(self, names):
+        """(generation, id) of version groups, which sorts them by release"""
+        return self._memoized(self._version_orders, names, lambda missing: [
+            parse_version_order(group)
+            for group in self._fetch_many([(f"version-group/{name}", None, ("id", "generation")) for name in missing])
+        ])
+
+    def get_learners(self, move, version=None):
+        """[(pokemon, version group, method, level)] for a move in one version group, from the learner index.
+        Without a version the move's learned_by_pokemon answers directly, as (pokemon, None, None, None).
+        Learners the index has not seen yet are fetched once, in one concurrent wave."""
+        move = self._make_request(f"move/{move}", fields=("name", "learned_by_pokemon"))
+        if not version:
+            return [(pokemon["name"], None, None, None) for pokemon in move["learned_by_pokemon"]]
+        missing = [pokemon["name"] for pokemon in move["learned_by_pokemon"] if pokemon["name"] not in self.learners]
+        if missing:
+            print(f"Indexing {len(missing)} Pokemon, the first version lookup of a move takes longer...")
+            # Only the move lists are kept, the payloads would crowd everything else out of the caches
+            payloads = self._fetch_many([(f"pokemon/{name}", None, ("moves",), False) for name in missing])
+            for name, pokemon in zip(missing, payloads):
+                self.learners.add(name, pokemon["moves"])
+        return self.learners.get(move["name"], version)
+
     def get_machine(self, id):
         return self._make_request(f"machine/{id}")
     
     def _prettify_machines(self, mach_list):
         if not mach_list:
             return None
-        new_machines = {}
-        for machine in mach_list:
-            id = machine["machine"]["url"].split("/")[-2]
-            api_dict = self.get_machine(id)
-            name = api_dict["item"]["name"]
-            game = pretty_string(api_dict["version_group"]["name"])
-            new_machine = {
-                name: {
-                    "Game": game
-                }
-            }
-            new_machines.update(new_machine)
-        return new_machines
+        # Resolve every machine concurrently, results come back in list order
+        return parse_machines(self._fetch_many([
+            (f"machine/{id}", None, MACHINE_FIELDS) for id in machine_ids(mach_list)
+        ]))
 
-    def get_stats(self, id):
-        pokemon = self.get_pokemon(id)
-        stats = pokemon["stats"]
-        types = pokemon["types"]
-        totals = {}
+    # Background prefetching
+    def prefetch(self, endpoints):
+        """Warm the caches with endpoints the user is likely to request next"""
+        if self.store is None: # Offline lookups are already local
+            self.prefetcher.submit(endpoints)
 
-        for stat in stats:
-            name = pretty_string(stat["stat"]["name"])
-            num = stat["base_stat"]
-            totals[name] = num
+    def cancel_prefetch(self):
+        """Drop every prefetch that has not started yet"""
+        self.prefetcher.cancel()
 
-        for i, type in enumerate(types):
-            totals[f"Type {i+1}"] = pretty_string(type["type"]["name"])
+    def get_stats(self, id):
+        if id not in self._stats:
+            self._stats[id] = parse_stats(self.get_pokemon(id, STATS_FIELDS))
+        return dict(self._stats[id])
+
+    def _memoized(self, memo, ids, fetch):
+        """memo's values for ids, keeping the input order. Ids not in memo yet are passed to
+        fetch once, which returns their values in order, usually from one concurrent wave."""
+        missing = [id for id in dict.fromkeys(ids) if id not in memo]
+        if missing:
+            memo.update(zip(missing, fetch(missing)))
+        return [memo[id] for id in ids]
 
-        return totals
+    def get_stats_many(self, ids):
+        """Stats for many Pokemon in one concurrent wave, results keep the input order.
+        Only the stat and type projection is kept, full payloads are dropped once parsed."""
+        return [dict(stats) for stats in self._memoized(self._stats, ids, lambda missing: self.gather("get_stats", missing))]
     
     def get_ability(self, id):
-        ability = self._make_request(f"ability/{id}")
-        entries = ability["flavor_text_entries"]
-        effects = {}
-
-        for entry in entries:
-            if entry["language"]["name"] == "en":
-                version = entry["version_group"]["name"]
-                effect = entry["flavor_text"].replace("\n", " ")
-                effects[version] = effect
-        
-        return effects
\ No newline at end of file
+        if id not in self._abilities:
+            self._abilities[id] = parse_ability(self._make_request(f"ability/{id}", fields=ABILITY_FIELDS))
+        return dict(self._abilities[id])
+
+    def get_abilities_many(self, ids):
+        """Ability texts for many abilities in one concurrent wave, results keep the input order.
+        Each ability is parsed once per session, later calls in any version are served from memory."""
+        return [dict(effects) for effects in self._memoized(self._abilities, ids, lambda missing: self.gather("get_ability", missing))]
+
+    def get_stat_table(self, verbose=True):
+        """StatTable of every Pokemon, loaded from disk and topped up with Pokemon it lacks.
+        The first build fetches every Pokemon's stats in one concurrent wave, past the response
+        caches since the table itself is saved."""
+        if self._stat_table is None:
+            table = (StatTable.load(self.base_url) if self.use_cache else None) or StatTable([], [], [])
+            known = set(table.names)
+            missing = [name for name in self.pokemon_dict if name not in known]
+            if missing:
+                if verbose:
+                    print(f"Gathering stats for {len(missing)} Pokemon...")
+                payloads = self._fetch_many([(f"pokemon/{name}", None, STATS_FIELDS, False) for name in missing])
+                fetched = StatTable.from_stats({name: parse_stats(pokemon) for name, pokemon in zip(missing, payloads)})
+                table = table.merge(fetched, keep=self.pokemon_names)
+                if self.use_cache:
+                    try:
+                        table.save(self.base_url)
+                    except OSError as e:
+                        print(f"Failed to save stat table: {e}")
+            self._stat_table = table
+        return self._stat_table
+
+    # Mirroring
+    def sync(self, families=SYNC_FAMILIES, refresh=False, store_path=None):
+        """Mirror whole resource families into the local store used by --offline,
+        returns {family: {"Resources", "Fetched", "Unchanged", "Failed"}}"""
+        if self.store is not None:
+            raise ValueError("Syncing needs network access, start without --offline")
+        from src.misc.store import LocalStore
+        return Syncer(self, LocalStore(store_path), workers=self.max_workers).run(families, refresh)
+
+    # Evolution chains
+    def get_evolution(self, name):
+        """Every stage of a Pokemon's evolution family, in chain order:
+        [{"species", "pokemon", "stage", "from", "trigger", "stats"}]. Chains are memoized by id,
+        so once one member is resolved the whole family is served from memory."""
+        chain_id = self._chain_ids.get(name)
+        if chain_id is None:
+            species = self.get_pokemon(name, ("species",))["species"]["name"]
+            chain_url = self._make_request(f"pokemon-species/{species}", fields=("evolution_chain",))["evolution_chain"]["url"]
+            chain_id = chain_url.rstrip("/").split("/")[-1]
+            self._chain_ids[name] = chain_id
+        if chain_id not in self._chains:
+            self._chains[chain_id] = self._resolve_chain(chain_id)
+        return [dict(stage) for stage in self._chains[chain_id]]
+
+    def _resolve_chain(self, chain_id):
+        stages = parse_chain(self._make_request(f"evolution-chain/{chain_id}", fields=("chain",))["chain"])
+        # Species whose name is not a Pokemon (like deoxys) use their default variety
+        species_names = [species for species, *_ in stages]
+        unnamed = [species for species in species_names if species not in self.pokemon_names]
+        defaults = {}
+        for species, payload in zip(unnamed, self._fetch_many([
+            (f"pokemon-species/{species}", None, ("varieties",)) for species in unnamed
+        ])):
+            defaults[species] = next(
+                variety["pokemon"]["name"] for variety in payload["varieties"] if variety["is_default"]
+            )
+        pokemon_names = [defaults.get(species, species) for species in species_names]
+        # Every stage's stats in one concurrent wave
+        all_stats = self.get_stats_many(pokemon_names)
+        resolved = []
+        for (species, stage, parent, details), pokemon, stats in zip(stages, pokemon_names, all_stats):
+            self._chain_ids[species] = self._chain_ids[pokemon] = chain_id
+            resolved.append({
+                "species": species,
+                "pokemon": pokemon,
+                "stage": stage,
+                "from": parent,
+                "trigger": parse_evolution_trigger(details),
+                "stats": stats
+            })
+        return resolved
+
+    # Type matchups
+    def get_type_chart(self):
+        """TypeChart built from all 18 /type payloads, fetched concurrently once per session"""
+        if self._type_chart is None:
+            self._type_chart = TypeChart(self._fetch_many([
+                (f"type/{name}", None, TYPE_FIELDS) for name in TYPE_NAMES
+            ]))
+        return self._type_chart
+
+    def _team_types(self, team):
+        if not 0 < len(team) <= 6:
+            raise ValueError("A team has one to six Pokemon")
+        chart = self.get_type_chart()
+        return chart, [
+            chart.types_of(name) or chart.type_pair(parse_types(self.get_pokemon(name, ("types",))))
+            for name in team
+        ]
+
+    def coverage(self, team):
+        """Defensive and offensive type summary of a team of up to six Pokemon:
+        {"defense": {member: {attacking type: multiplier}}, "weak"/"resist": {type: members},
+        "covered": super effective pairings, "pairings": all pairings, "resisted": [pairings]}"""
+        chart, types = self._team_types(team)
+        report = chart.coverage(types)
+        return {
+            "defense": {
+                name: dict(zip(TYPE_NAMES, row.tolist())) for name, row in zip(team, report["defense"])
+            },
+            "weak": dict(zip(TYPE_NAMES, report["weak"].tolist())),
+            "resist": dict(zip(TYPE_NAMES, report["resist"].tolist())),
+            "covered": report["covered"],
+            "pairings": len(chart.pairings),
+            "resisted": report["resisted"]
+        }
+
+    def suggest_teammates(self, team, limit=10):
+        """Roster Pokemon ranked by how well they patch the team's weaknesses,
+        as (name, resists, shared weaknesses, new coverage) tuples"""
+        chart, types = self._team_types(team)
+        return chart.rank_teammates(types, limit, exclude=team)
+
+    # Concurrent waves through the asyncio client
+    @poke_api_retry(automatic=False)
+    def _run_wave(self, make_coro):
+        """Run make_coro(self.aio) to completion, the retry prompt covers the whole wave"""
+        return asyncio.run(make_coro(self.aio))
+
+    def gather(self, method, ids):
+        """Call an async client method for every id as one concurrent wave: gather("get_stats", names)"""
+        return self._run_wave(lambda aio: aio.gather(getattr(aio, method)(id) for id in ids))
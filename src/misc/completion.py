@@ -0,0 +1,37 @@
+from bisect import bisect_left
+from src.misc.lazy import LazyModule
+
+difflib = LazyModule("difflib")
+
+class CompletionIndex:
+    """Sorted name index with prefix lookup and fuzzy suggestions"""
+    __slots__ = ("names",)
+
+    def __init__(self, names):
+        self.names = sorted(set(names))
+
+    def __contains__(self, name):
+        i = bisect_left(self.names, name)
+        return i < len(self.names) and self.names[i] == name
+
+    def __len__(self):
+        return len(self.names)
+
+    def prefix(self, text, limit=None):
+        """Sorted names starting with text, found with a binary search"""
+        start = bisect_left(self.names, text)
+        # Every name with the prefix sorts before text + the highest code point
+        end = bisect_left(self.names, text + "\U0010ffff", start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.names[start:end]
+
+    def fuzzy(self, text, limit=10, cutoff=0.6):
+        """Closest names to a possibly misspelled text, best match first"""
+        return difflib.get_close_matches(text, self.names, n=limit, cutoff=cutoff)
+
+    def complete(self, text, limit=50):
+        """Prefix matches for tab completion, falling back to fuzzy matches"""
+        if not text:
+            return self.names[:limit]
+        return self.prefix(text) or self.fuzzy(text)
@@ -0,0 +1,265 @@
+import io
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from src.misc.cache import default_cache_dir
+from src.misc.completion import CompletionIndex
+from src.misc.lazy import LazyModule
+from src.misc.metrics import Metrics
+from src.misc.prefetch import Prefetcher
+from src.misc.util import ThreadStdout
+
+requests = LazyModule("requests")
+
+# Client methods a thin client may call, everything else stays private to the daemon
+REMOTE_METHODS = {
+    "get_pokemon", "get_pokemon_list", "get_berry", "get_item", "get_versions", "get_move",
+    "get_usable_move", "get_damage_moves", "get_machine", "get_stats", "get_stats_many", "get_ability",
+    "get_abilities_many", "get_learners", "get_evolution", "get_stat_table", "get_type_chart",
+    "coverage", "suggest_teammates", "gather", "prefetch", "cancel_prefetch", "sync", "names"
+}
+_HEADER = struct.Struct("!I")
+
+def default_socket_path():
+    return os.path.join(default_cache_dir(), "daemon.sock")
+
+def _send(sock, obj):
+    body = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+def _recv(sock):
+    """Read one framed message, None once the peer has closed the connection"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    body = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if body is None:
+        raise ConnectionError("Daemon connection closed mid message")
+    return pickle.loads(body)
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def _portable(e):
+    """An exception the thin client can unpickle and report like a local one"""
+    if isinstance(e, requests.RequestException):
+        return requests.RequestException(str(e))
+    if isinstance(e, (ValueError, KeyError)):
+        return e
+    # Reported by the command loop like any other failed request
+    return requests.RequestException(f"Daemon error: {type(e).__name__}: {e}")
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        session = None
+        try:
+            while (message := _recv(self.request)) is not None:
+                if session is None:
+                    session = self.server.open_session(message[-1])
+                _send(self.request, self.server.dispatch(*message))
+        finally:
+            if session is not None:
+                self.server.close_session(session)
+
+class PokedexDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves one warm PokeApiClient to thin clients over a Unix socket.
+
+    Every session shares the client's session pool, caches and indexes, while
+    its requests are also counted per command for that session alone and it
+    prefetches through a Prefetcher of its own, so one session's cancel never
+    drops another's queue. Calls
+    are pickled, so the socket is only accessible to the user who started it.
+    """
+    daemon_threads = True
+
+    def __init__(self, client, path=None):
+        self.client = client
+        self.path = path or default_socket_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Left behind by a daemon that did not shut down cleanly
+        previous = os.umask(0o177)
+        try:
+            super().__init__(self.path, _Handler)
+        finally:
+            os.umask(previous)
+        self._sessions = {}  # Session: open connections, a thin client opens one per thread
+        self._prefetchers = {}  # Session: its Prefetcher, started on first use
+        self._sessions_lock = threading.Lock()
+        # Output printed while serving a call goes back to the caller
+        self.stdout = sys.stdout = ThreadStdout(sys.stdout)
+
+    def open_session(self, session):
+        with self._sessions_lock:
+            self._sessions[session] = self._sessions.get(session, 0) + 1
+        return session
+
+    def close_session(self, session):
+        """Forget a session's command metrics and stop its prefetching once its last connection closes"""
+        with self._sessions_lock:
+            self._sessions[session] -= 1
+            if self._sessions[session]:
+                return
+            del self._sessions[session]
+            prefetcher = self._prefetchers.pop(session, None)
+        if prefetcher:
+            prefetcher.close()
+        self.client.metrics.drop_session(session)
+
+    def _prefetcher(self, session):
+        with self._sessions_lock:
+            if session not in self._prefetchers:
+                self._prefetchers[session] = Prefetcher(self.client)
+            return self._prefetchers[session]
+
+    def dispatch(self, method, args, kwargs, command, session):
+        """Run one call for a session, returns (ok, result or exception, printed output)"""
+        self.stdout.local.buffer = io.StringIO()
+        metrics = self.client.metrics
+        try:
+            with metrics.session(session), metrics.label(command):
+                if method == "index":
+                    result = {"pokemon": self.client.pokemon_dict, "versions": sorted(self.client.versions)}
+                elif method == "endpoint_report":
+                    result = metrics.endpoint_report()
+                elif method == "command_report":
+                    result = metrics.command_report(session)
+                elif method == "reset_session":
+                    result = metrics.drop_session(session)
+                elif method == "prefetch":
+                    if self.client.store is None:  # Offline lookups are already local
+                        self._prefetcher(session).submit(*args, **kwargs)
+                    result = None
+                elif method == "cancel_prefetch":
+                    with self._sessions_lock:
+                        prefetcher = self._prefetchers.get(session)
+                    result = prefetcher and prefetcher.cancel()
+                elif method in REMOTE_METHODS:
+                    result = getattr(self.client, method)(*args, **kwargs)
+                else:
+                    raise ValueError(f"Unknown daemon call: {method}")
+            return True, result, self.stdout.local.buffer.getvalue()
+        except Exception as e:
+            return False, _portable(e), self.stdout.local.buffer.getvalue()
+        finally:
+            self.stdout.local.buffer = None
+
+    def server_close(self):
+        super().server_close()
+        sys.stdout = self.stdout.stream
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+class _DaemonMetrics(Metrics):
+    """Command timings are kept per session, request metrics come from the daemon.
+    Requests by command are this session's own, requests by endpoint the whole daemon's."""
+
+    def __init__(self, client):
+        self.client = None
+        super().__init__()
+        self.client = client
+
+    def reset(self):
+        super().reset()
+        if self.client:
+            self.client._call("reset_session")
+
+    def endpoint_report(self):
+        return self.client._call("endpoint_report")
+
+    def command_report(self, session=None):
+        report = super().command_report()
+        for name, remote in self.client._call("command_report").items():
+            entry = report.setdefault(name, {"Runs": 0, "Mean Ms": 0})
+            entry.update((key, value) for key, value in remote.items() if key not in ("Runs", "Mean Ms"))
+        return dict(sorted(report.items()))
+
+class DaemonClient:
+    """Thin stand-in for PokeApiClient that forwards calls to a running daemon.
+
+    The name and version index is copied once on attach, so completion and
+    name checks stay local. Each thread gets its own connection.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_socket_path()
+        self.session = os.urandom(8).hex()  # Tags this client's calls on every connection
+        self._local = threading.local()
+        self.metrics = _DaemonMetrics(self)
+        # Attach failures stay OSErrors so the caller can fall back to a local client
+        ok, index, _ = self._exchange(("index", (), {}, None, self.session))
+        self.pokemon_dict = index["pokemon"]
+        self.pokemon_names = set(self.pokemon_dict)
+        self.pokemon_index = CompletionIndex(self.pokemon_names)
+        self.versions = set(index["versions"])
+        self._stat_table = None
+        self._name_indexes = {}
+
+    def _connection(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = self._local.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                self._local.sock = None
+                raise
+        return sock
+
+    def _exchange(self, message):
+        sock = self._connection()
+        try:
+            _send(sock, message)
+            response = _recv(sock)
+            if response is None:
+                raise ConnectionError("The Pokedex daemon closed the connection")
+            return response
+        except OSError:
+            sock.close()
+            self._local.sock = None
+            raise
+
+    def _call(self, method, *args, **kwargs):
+        message = (method, args, kwargs, self.metrics._current_command(), self.session)
+        try:
+            response = self._exchange(message)
+        except OSError:
+            # The daemon may have restarted, try a fresh connection once
+            try:
+                response = self._exchange(message)
+            except OSError as e:
+                raise requests.RequestException(f"Lost the Pokedex daemon at {self.path}: {e}")
+        ok, result, output = response
+        if output:
+            sys.stdout.write(output)
+        if not ok:
+            raise result
+        return result
+
+    def get_stat_table(self, verbose=True):
+        # Large and rarely changing, fetched once per session
+        if self._stat_table is None:
+            self._stat_table = self._call("get_stat_table", verbose)
+        return self._stat_table
+
+    def names(self, resource):
+        if resource not in self._name_indexes:
+            self._name_indexes[resource] = self._call("names", resource)
+        return self._name_indexes[resource]
+
+    def __getattr__(self, name):
+        if name not in REMOTE_METHODS:
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self._call(name, *args, **kwargs)
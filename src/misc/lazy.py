@@ -0,0 +1,15 @@
+import importlib
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+    Keeps heavy dependencies off the startup path, imports are thread-safe."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
@@ -0,0 +1,72 @@
+import os
+import threading
+from src.misc.cache import default_cache_dir
+from src.misc.lazy import LazyModule
+
+sqlite3 = LazyModule("sqlite3")
+
+# Bump when the table layout changes so stale indexes are rebuilt
+LEARNERS_FORMAT = 1
+
+def default_learners_path():
+    return os.path.join(default_cache_dir(), "learners.sqlite3")
+
+class LearnerIndex:
+    """Reverse move index: move -> (pokemon, version group, learn method, level).
+
+    Filled from Pokemon payloads as they are fetched, so each Pokemon's move
+    list is scanned once and kept across sessions. Lookups go through the
+    (move, version) index and never touch the network.
+    """
+
+    def __init__(self, base_url, path=None):
+        self.path = path or default_learners_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        source = f"{LEARNERS_FORMAT} {base_url}"
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS learners "
+                "(move TEXT NOT NULL, version TEXT NOT NULL, pokemon TEXT NOT NULL, method TEXT NOT NULL, level INTEGER)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS learners_move ON learners (move, version)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS indexed (pokemon TEXT PRIMARY KEY)")
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+            if row and row[0] != source:
+                # Built from another API or an older layout
+                self._conn.execute("DELETE FROM learners")
+                self._conn.execute("DELETE FROM indexed")
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (source,))
+            self.indexed = {row[0] for row in self._conn.execute("SELECT pokemon FROM indexed")}
+
+    def __contains__(self, pokemon):
+        return pokemon in self.indexed
+
+    def add(self, pokemon, moves):
+        """Index a Pokemon's moves[].version_group_details, once per Pokemon"""
+        if pokemon in self.indexed:
+            return
+        rows = [
+            (move["move"]["name"], detail["version_group"]["name"], pokemon,
+             detail["move_learn_method"]["name"], detail["level_learned_at"])
+            for move in moves for detail in move["version_group_details"]
+        ]
+        with self._lock, self._conn:
+            if pokemon in self.indexed:
+                return
+            self._conn.executemany("INSERT INTO learners VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.execute("INSERT INTO indexed VALUES (?)", (pokemon,))
+            self.indexed.add(pokemon)
+
+    def get(self, move, version=None):
+        """[(pokemon, version group, method, level)] for a move, optionally in one version group"""
+        query = "SELECT pokemon, version, method, level FROM learners WHERE move = ?"
+        params = (move,)
+        if version:
+            query += " AND version = ?"
+            params += (version,)
+        with self._lock:
+            return self._conn.execute(query + " ORDER BY pokemon, version, method", params).fetchall()
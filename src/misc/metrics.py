@@ -0,0 +1,251 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency histogram bucket upper bounds in milliseconds, the last bucket is open ended
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+CACHE_SOURCES = ("memory", "disk", "revalidated", "offline", "shared")
+
+def endpoint_family(endpoint, params=None):
+    """Group 'pokemon/pikachu' as 'pokemon' and paginated lists as 'pokemon list'"""
+    path, _, query = endpoint.strip("/").partition("?")
+    segments = path.split("/")
+    if params or query or len(segments) < 2:
+        return f"{segments[0]} list"
+    return segments[0]
+
+class RequestRecord:
+    """One request as it passes through the client, filled in by _make_request"""
+    __slots__ = ("endpoint", "params", "source", "size")
+
+    def __init__(self, endpoint, params):
+        self.endpoint = endpoint
+        self.params = params
+        self.source = None
+        self.size = 0
+
+class _Stats:
+    """Counters and a latency histogram for one endpoint family or command"""
+    __slots__ = ("requests", "network", "cached", "errors", "seconds", "max_seconds", "bytes", "histogram", "endpoints")
+
+    def __init__(self):
+        self.requests = 0
+        self.network = 0
+        self.cached = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.endpoints = {}
+
+    def add(self, source, seconds, size):
+        self.requests += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if source == "error":
+            self.errors += 1
+        elif source in CACHE_SOURCES:
+            self.cached += 1
+        else:
+            self.network += 1
+            self.bytes += size
+        milliseconds = seconds * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if milliseconds <= bound:
+                self.histogram[i] += 1
+                break
+        else:
+            self.histogram[-1] += 1
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding the given fraction of requests"""
+        target = fraction * self.requests
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else round(self.max_seconds * 1000)
+        return 0
+
+    def summary(self):
+        return {
+            "Requests": self.requests,
+            "Network": self.network,
+            "Cache Hit Ratio": f"{self.cached / self.requests:.0%}" if self.requests else "n/a",
+            "Errors": self.errors,
+            "Mean Ms": round(self.seconds * 1000 / self.requests, 1) if self.requests else 0,
+            "P95 Ms": self.percentile(0.95),
+            "Max Ms": round(self.max_seconds * 1000, 1),
+            "Bytes": self.bytes,
+        }
+
+class _Frame:
+    __slots__ = ("name", "start", "nested")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.nested = 0.0
+
+class Metrics:
+    """Request and command instrumentation for PokeApiClient and the command layer"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._trace = None
+        self._last_command = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}  # endpoint family: _Stats
+            self.commands = {}   # command name: [runs, seconds, _Stats of its requests]
+            self.sessions = {}   # daemon session: commands of that session alone
+            self.events = {"retries": 0, "ssl_fallbacks": 0}
+
+    # Tracing
+    def trace_to(self, path):
+        """Append one JSON line per request and command to path, None stops tracing"""
+        with self._lock:
+            if self._trace:
+                self._trace.close()
+            self._trace = open(path, "a", encoding="utf-8") if path else None
+
+    def _write_trace(self, record):
+        if self._trace:
+            self._trace.write(json.dumps(record) + "\n")
+            self._trace.flush()
+
+    # Attribution
+    @contextmanager
+    def label(self, name):
+        """Attribute requests made on this thread to name, e.g. background work"""
+        previous = getattr(self._local, "label", None)
+        self._local.label = name
+        try:
+            yield
+        finally:
+            self._local.label = previous
+
+    @contextmanager
+    def session(self, key):
+        """Also attribute requests made on this thread to a daemon session's commands"""
+        previous = getattr(self._local, "session", None)
+        self._local.session = key
+        try:
+            yield
+        finally:
+            self._local.session = previous
+
+    def drop_session(self, key):
+        with self._lock:
+            self.sessions.pop(key, None)
+
+    def bind(self, func):
+        """func wrapped to run under this thread's command and session, for work handed to other threads"""
+        command, session = self._current_command(), getattr(self._local, "session", None)
+
+        def bound(*args, **kwargs):
+            with self.label(command), self.session(session):
+                return func(*args, **kwargs)
+        return bound
+
+    def _current_command(self):
+        label = getattr(self._local, "label", None)
+        if label:
+            return label
+        stack = getattr(self._local, "stack", None)
+        # Worker threads have no stack, their requests belong to the latest command
+        return stack[-1].name if stack else self._last_command
+
+    @contextmanager
+    def command(self, name):
+        """Time a command, excluding the time spent in commands nested inside it"""
+        if not name:
+            yield
+            return
+        stack = self._local.__dict__.setdefault("stack", [])
+        frame = _Frame(name)
+        stack.append(frame)
+        self._last_command = name
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - frame.start
+            if stack:
+                stack[-1].nested += elapsed
+                self._last_command = stack[-1].name
+            seconds = elapsed - frame.nested
+            with self._lock:
+                entry = self.commands.setdefault(name, [0, 0.0, _Stats()])
+                entry[0] += 1
+                entry[1] += seconds
+                self._write_trace({"type": "command", "time": time.time(), "command": name, "seconds": seconds})
+
+    # Requests
+    @contextmanager
+    def request(self, endpoint, params=None):
+        """Time a request, the caller fills in the record's source and size"""
+        record = RequestRecord(endpoint, params)
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception:
+            record.source = "error"
+            raise
+        finally:
+            self._add(record, time.perf_counter() - start)
+
+    def _add(self, record, seconds):
+        family = endpoint_family(record.endpoint, record.params)
+        source = record.source or "network"
+        command = self._current_command()
+        session = getattr(self._local, "session", None)
+        with self._lock:
+            self.endpoints.setdefault(family, _Stats()).add(source, seconds, record.size)
+            if command:
+                tables = [self.commands] if session is None else [self.commands, self.sessions.setdefault(session, {})]
+                for commands in tables:
+                    command_stats = commands.setdefault(command, [0, 0.0, _Stats()])[2]
+                    command_stats.add(source, seconds, record.size)
+                    command_stats.endpoints.setdefault(family, _Stats()).add(source, seconds, record.size)
+            self._write_trace({
+                "type": "request", "time": time.time(), "command": command, "endpoint": record.endpoint,
+                "params": record.params, "source": source, "seconds": seconds, "bytes": record.size
+            })
+
+    def event(self, name):
+        """Count a retry, SSL fallback or similar event"""
+        with self._lock:
+            self.events[name] = self.events.get(name, 0) + 1
+            self._write_trace({"type": "event", "time": time.time(), "event": name, "command": self._current_command()})
+
+    # Reporting
+    def endpoint_report(self):
+        with self._lock:
+            return {family: stats.summary() for family, stats in sorted(self.endpoints.items())}
+
+    def command_report(self, session=None):
+        """Requests by command, only those of one daemon session when session is given"""
+        with self._lock:
+            report = {}
+            commands = self.commands if session is None else self.sessions.get(session, {})
+            for name, (runs, seconds, stats) in sorted(commands.items()):
+                # Endpoints sorted by the time they took, the dominant one first
+                endpoints = sorted(stats.endpoints.items(), key=lambda item: -item[1].seconds)
+                report[name] = {
+                    "Runs": runs,
+                    "Mean Ms": round(seconds * 1000 / runs, 1) if runs else 0,
+                    "Requests": stats.requests,
+                    "Network": stats.network,
+                    "Bytes": stats.bytes,
+                    "Endpoints": {
+                        family: f"{family_stats.requests} requests, {family_stats.seconds * 1000:.0f} ms"
+                        for family, family_stats in endpoints
+                    }
+                }
+            return report
@@ -0,0 +1,36 @@
+from collections import namedtuple
+
+# One way a Pokemon learns a move in a version group
+MoveEntry = namedtuple("MoveEntry", ["name", "level", "method"])
+
+class MoveIndex:
+    """A Pokemon's moves indexed by version group and learn method, built once per Pokemon"""
+    __slots__ = ("by_version", "by_method")
+
+    def __init__(self, moves):
+        self.by_version = {}  # version group: {move name: first MoveEntry}
+        self.by_method = {}   # (version group, learn method): [move names]
+        for move in moves:
+            name = move["move"]["name"]
+            for detail in move["version_group_details"]:
+                version = detail["version_group"]["name"]
+                method = detail["move_learn_method"]["name"]
+                entry = MoveEntry(name, detail["level_learned_at"], method)
+                self.by_version.setdefault(version, {}).setdefault(name, entry)
+                names = self.by_method.setdefault((version, method), [])
+                if not names or names[-1] != name:
+                    names.append(name)
+
+    @property
+    def versions(self):
+        return set(self.by_version)
+
+    def get(self, version, name):
+        """The MoveEntry for a move in a version group, or None"""
+        return self.by_version.get(version, {}).get(name)
+
+    def names(self, version, method=None):
+        """Move names learned in a version group, optionally by one learn method"""
+        if method is None:
+            return list(self.by_version.get(version, {}))
+        return list(self.by_method.get((version, method), []))
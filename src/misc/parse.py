@@ -0,0 +1,164 @@
+import json
+from functools import lru_cache
+from src.misc.util import pretty_string
+
+# Fields each parser reads, used to project payloads as they are decoded
+STATS_FIELDS = ("stats", "types")
+ABILITY_FIELDS = ("flavor_text_entries",)
+MACHINE_FIELDS = ("item", "version_group")
+POKEMON_CONTEXT_FIELDS = ("abilities", "moves", "stats", "types")
+TYPE_FIELDS = ("name", "damage_relations", "pokemon")
+DAMAGE_MOVE_FIELDS = ("power", "type", "damage_class", "past_values")
+
+# Move keys that are not shown to the user
+MOVE_KEYS_TO_DEL = [
+    "contest_combos",
+    "contest_effect",
+    "contest_type",
+    "effect_changes",
+    "effect_entries",
+    "flavor_text_entries",
+    "generation",
+    "id",
+    "learned_by_pokemon",
+    "meta",
+    "name",
+    "names",
+    "past_values",
+    "stat_changes",
+    "super_contest_effect",
+    "target",
+    "type"
+]
+
+@lru_cache(maxsize=None)
+def _loads():
+    """orjson.loads when it is installed, it is several times faster than the json module.
+    Looked up on the first decode so it does not slow down startup."""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+def decode_json(body, fields=None):
+    """Decode a UTF-8 JSON body straight from bytes, keeping only the given top level fields"""
+    return project(_loads()(body), fields)
+
+def project(data, fields=None):
+    """Keep only the given top level fields of a payload so the rest can be freed"""
+    if not fields or not isinstance(data, dict):
+        return data
+    return {field: data[field] for field in fields if field in data}
+
+def parse_move(move):
+    """Build the displayable move dict, machines are left unresolved.
+    The API payload is not modified so it can be shared between callers."""
+    move = dict(move)
+    move["damage_class"] = move["damage_class"]["name"]
+    move["effects"] = [effect["short_effect"] for effect in move["effect_entries"]]
+    for key in MOVE_KEYS_TO_DEL:
+        move.pop(key, None)
+    if move["effect_chance"] is None:
+        move.pop("effect_chance", None)
+    return move
+
+def machine_ids(mach_list):
+    """Extract machine ids from a move's machine list"""
+    return [machine["machine"]["url"].split("/")[-2] for machine in mach_list]
+
+def parse_machines(api_dicts):
+    """Build {machine item: {"Game": version}} from machine payloads"""
+    new_machines = {}
+    for api_dict in api_dicts:
+        name = api_dict["item"]["name"]
+        game = pretty_string(api_dict["version_group"]["name"])
+        new_machine = {
+            name: {
+                "Game": game
+            }
+        }
+        new_machines.update(new_machine)
+    return new_machines
+
+def parse_stats(pokemon):
+    """Build {stat: base stat} plus types from a Pokemon payload"""
+    stats = pokemon["stats"]
+    types = pokemon["types"]
+    totals = {}
+
+    for stat in stats:
+        name = pretty_string(stat["stat"]["name"])
+        num = stat["base_stat"]
+        totals[name] = num
+
+    for i, type in enumerate(types):
+        totals[f"Type {i+1}"] = pretty_string(type["type"]["name"])
+
+    return totals
+
+def parse_damage_move(move):
+    """Power, type and damage class of a move payload, power is None for status and variable power moves.
+    past lists (version group, power, type) for each version group that changed them, None when unchanged."""
+    return {
+        "power": move["power"],
+        "type": move["type"]["name"],
+        "damage_class": move["damage_class"]["name"],
+        "past": [
+            (past["version_group"]["name"], past["power"], past["type"]["name"] if past["type"] else None)
+            for past in move.get("past_values", ())
+        ]
+    }
+
+def parse_version_order(version_group):
+    """(generation, id) of a version group payload, which sorts version groups by release"""
+    return (int(version_group["generation"]["url"].rstrip("/").split("/")[-1]), version_group["id"])
+
+def parse_types(pokemon):
+    """Type names of a Pokemon payload in slot order"""
+    return [type["type"]["name"] for type in sorted(pokemon["types"], key=lambda type: type["slot"])]
+
+def parse_chain(chain):
+    """Walk an evolution chain level by level, as [(species, stage, evolves from, evolution_details)]"""
+    stages = []
+    level = [(chain, None)]
+    stage = 0
+    while level:
+        next_level = []
+        for link, parent in level:
+            species = link["species"]["name"]
+            stages.append((species, stage, parent, link["evolution_details"]))
+            next_level.extend((child, species) for child in link["evolves_to"])
+        level = next_level
+        stage += 1
+    return stages
+
+def parse_evolution_trigger(details):
+    """Short description of how a Pokemon evolves from its evolution_details"""
+    if not details:
+        return "Base"
+    detail = details[0]
+    if detail.get("min_level"):
+        return f"Level {detail['min_level']}"
+    if detail.get("item"):
+        return f"Use {pretty_string(detail['item']['name'])}"
+    if detail.get("held_item"):
+        return f"Hold {pretty_string(detail['held_item']['name'])}"
+    if detail.get("known_move"):
+        return f"Know {pretty_string(detail['known_move']['name'])}"
+    if detail.get("min_happiness"):
+        return "Friendship"
+    return pretty_string(detail["trigger"]["name"])
+
+def parse_ability(ability):
+    """Build {version group: English flavor text} from an ability payload"""
+    entries = ability["flavor_text_entries"]
+    effects = {}
+
+    for entry in entries:
+        if entry["language"]["name"] == "en":
+            version = entry["version_group"]["name"]
+            effect = entry["flavor_text"].replace("\n", " ")
+            effects[version] = effect
+
+    return effects
@@ -0,0 +1,53 @@
+import queue
+import threading
+import time
+from src.misc.lazy import LazyModule
+
+requests = LazyModule("requests")
+
+class Prefetcher:
+    """Fetches endpoints on a background thread to warm the client's caches.
+
+    Requests go out one at a time and at most `rate` per second so prefetching
+    never competes with the user's own commands for bandwidth. cancel() drops
+    everything queued so far and close() also stops the thread.
+    """
+
+    def __init__(self, client, rate=5.0):
+        self.client = client
+        self.interval = 1 / rate
+        self._queue = queue.Queue()
+        self._generation = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, endpoints):
+        with self._lock:
+            for endpoint in endpoints:
+                self._queue.put((self._generation, endpoint))
+            if self._thread is None:
+                # The thread's requests count for the session that first submitted
+                self._thread = threading.Thread(target=self.client.metrics.bind(self._run), daemon=True)
+                self._thread.start()
+
+    def cancel(self):
+        """Skip every queued endpoint, a request already in flight is left to finish"""
+        with self._lock:
+            self._generation += 1
+
+    def close(self):
+        with self._lock:
+            self._generation += 1
+            self._queue.put(None)
+
+    def _run(self):
+        while (item := self._queue.get()) is not None:
+            generation, endpoint = item
+            if generation != self._generation or self.client._in_memory(endpoint):
+                continue
+            try:
+                with self.client.metrics.label("prefetch"):
+                    self.client._quiet_request(endpoint)
+            except (requests.RequestException, KeyError, ValueError):
+                pass  # Prefetching is best effort, the real request will report errors
+            time.sleep(self.interval)
@@ -0,0 +1,62 @@
+import threading
+import time
+
+def retry_after_seconds(response):
+    """Seconds asked for by a Retry-After header, None when absent or unreadable"""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class RateLimiter:
+    """Token bucket shared between threads, with a rate that adapts to the server.
+
+    Each success grows the rate by a factor of `growth` up to max_rate, each
+    throttling signal (429, 5xx, timeouts) halves it down to min_rate, and a
+    Retry-After pauses every caller until it has passed. Growing by a factor
+    means a rate halved to min_rate is back at full speed within a few dozen
+    requests instead of crawling up by a fixed step.
+    """
+
+    def __init__(self, rate=20.0, min_rate=1.0, max_rate=None, growth=1.1):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.growth = growth
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                wait = self.paused_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate * self.growth)
+
+    def throttled(self, retry_after=None):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
@@ -0,0 +1,75 @@
+import random
+import threading
+import time
+from src.misc.lazy import LazyModule
+
+requests = LazyModule("requests")
+
+class RetryPolicy:
+    """How failed requests are retried: exponential backoff with full jitter.
+    Connection errors, timeouts, 429 and 5xx responses are retried. SSL failures and
+    other client errors are not, retrying them only repeats the same refusal."""
+
+    def __init__(self, max_retries=3, base_delay=0.5, max_delay=30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def retryable(self, error):
+        if isinstance(error, requests.exceptions.SSLError):
+            return False
+        response = getattr(error, "response", None)
+        if response is None:
+            return True
+        return response.status_code == 429 or response.status_code >= 500
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt, at least what the server asked for"""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        return max(backoff, min(retry_after or 0, self.max_delay))
+
+class CircuitBreaker:
+    """Fails fast once `threshold` requests in a row have failed.
+
+    While open every request is refused for `cooldown` seconds, then a single
+    trial request is let through: success closes the breaker, failure opens it
+    for another cooldown.
+    """
+
+    def __init__(self, threshold=5, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request may go out, taking the trial slot when the cooldown has passed"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                self.opened_at = time.monotonic()  # Later callers wait for the trial's outcome
+                return True
+            return False
+
+    def remaining(self):
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(self.cooldown - (time.monotonic() - self.opened_at), 0.0)
+
+    @property
+    def open(self):
+        return self.remaining() > 0
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
@@ -0,0 +1,32 @@
+import json
+import os
+import tempfile
+import time
+from src.misc.cache import default_cache_dir
+
+# Bump when the snapshot layout changes so stale files are ignored
+SNAPSHOT_FORMAT = 1
+
+def snapshot_path():
+    return os.path.join(default_cache_dir(), "index.json")
+
+def load_snapshot(base_url, path=None):
+    """Return the saved name index for base_url, or None if missing or outdated"""
+    try:
+        with open(path or snapshot_path(), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("format") != SNAPSHOT_FORMAT or data.get("base_url") != base_url:
+        return None
+    return data
+
+def save_snapshot(base_url, index, path=None):
+    """Atomically write the name index so readers never see a partial file"""
+    path = path or snapshot_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {"format": SNAPSHOT_FORMAT, "base_url": base_url, "saved": time.time()} | index
+    # A temp file of its own, so clients saving together never move each other's file
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(path), suffix=".tmp", delete=False) as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(f.name, path)
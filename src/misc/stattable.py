@@ -0,0 +1,142 @@
+import operator
+import os
+import re
+import tempfile
+from src.misc.cache import default_cache_dir
+from src.misc.lazy import LazyModule
+from src.misc.typechart import TYPE_NAMES, NO_TYPE
+from src.misc.util import pretty_string
+
+np = LazyModule("numpy")
+
+# Bump when the saved layout changes so stale files are rebuilt
+STAT_TABLE_FORMAT = 1
+
+STAT_COLUMNS = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+STAT_ALIASES = {
+    "atk": "attack", "def": "defense", "spa": "special-attack", "spatk": "special-attack",
+    "spd": "special-defense", "spdef": "special-defense", "spe": "speed", "bst": "total"
+}
+OPERATORS = {
+    "<=": operator.le, ">=": operator.ge, "!=": operator.ne, "==": operator.eq,
+    "=": operator.eq, "<": operator.lt, ">": operator.gt
+}
+CONDITION = re.compile(r"^([a-z-]+)(<=|>=|!=|==|=|<|>)([a-z0-9-]+)$")
+
+def stat_table_path():
+    return os.path.join(default_cache_dir(), "stats.npz")
+
+def stat_column(name):
+    """Canonical column name for a stat or alias, raising ValueError for unknown stats"""
+    name = STAT_ALIASES.get(name, name)
+    if name not in STAT_COLUMNS and name != "total":
+        raise ValueError(f"Unknown stat: {name}")
+    return name
+
+class StatTable:
+    """Base stats and types of every Pokemon, stored column-wise in NumPy arrays.
+
+    stats is an (N, 6) int16 array in STAT_COLUMNS order and types an (N, 2)
+    array of TYPE_NAMES indices, NO_TYPE for single type Pokemon. Queries are
+    evaluated over whole columns at once.
+    """
+
+    def __init__(self, names, stats, types):
+        self.names = list(names)
+        self.stats = np.asarray(stats, dtype=np.int16).reshape(-1, len(STAT_COLUMNS))
+        self.types = np.asarray(types, dtype=np.int8).reshape(-1, 2)
+        self.total = self.stats.sum(axis=1, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_stats(cls, stats_by_name):
+        """Build from {name: parse_stats dict}"""
+        names, stats, types = [], [], []
+        index = {pretty_string(name): i for i, name in enumerate(TYPE_NAMES)}
+        for name, stats_dict in stats_by_name.items():
+            names.append(name)
+            stats.append([stats_dict.get(pretty_string(column), 0) for column in STAT_COLUMNS])
+            types.append([index.get(stats_dict.get(f"Type {slot}"), NO_TYPE) for slot in (1, 2)])
+        return cls(names, stats, types)
+
+    def merge(self, other, keep=None):
+        """New table with other's rows added, keeping only names in keep when given"""
+        names = self.names + other.names
+        rows = [i for i, name in enumerate(names) if keep is None or name in keep]
+        stats = np.concatenate([self.stats, other.stats])[rows]
+        types = np.concatenate([self.types, other.types])[rows]
+        return StatTable([names[i] for i in rows], stats, types)
+
+    def take(self, rows):
+        """New table with only the given rows, in that order"""
+        return StatTable([self.names[i] for i in rows], self.stats[rows], self.types[rows])
+
+    def column(self, name):
+        name = stat_column(name)
+        return self.total if name == "total" else self.stats[:, STAT_COLUMNS.index(name)]
+
+    def mask(self, conditions):
+        """Boolean row mask for conditions like 'speed>100' or 'type=fire', all must hold"""
+        mask = np.ones(len(self.names), dtype=bool)
+        for condition in conditions:
+            match = CONDITION.match(condition.lower())
+            if not match:
+                raise ValueError(f"Invalid condition: {condition} (try speed>100 or type=fire)")
+            name, op, value = match.groups()
+            if name == "type":
+                if value not in TYPE_NAMES or op not in ("=", "==", "!="):
+                    raise ValueError(f"Invalid type condition: {condition}")
+                has_type = (self.types == TYPE_NAMES.index(value)).any(axis=1)
+                mask &= ~has_type if op == "!=" else has_type
+            else:
+                if not value.isdigit():
+                    raise ValueError(f"Stats compare against numbers: {condition}")
+                mask &= OPERATORS[op](self.column(name), int(value))
+        return mask
+
+    def query(self, conditions=(), sort=None, limit=None):
+        """Row indices matching every condition, highest sort stat first"""
+        rows = np.flatnonzero(self.mask(conditions))
+        if sort is None:
+            return rows[:limit].tolist()
+        values = self.column(sort)[rows]
+        if limit is not None and 0 < limit < len(rows):
+            # Top-k without sorting every match, ties at the cut are taken in table order
+            # so a limit returns the head of the full ranking
+            cut = np.partition(values, len(values) - limit)[len(values) - limit]
+            above, ties = np.flatnonzero(values > cut), np.flatnonzero(values == cut)
+            top = np.concatenate([above, ties[:limit - len(above)]])
+            rows, values = rows[top], values[top]
+        return rows[np.argsort(-values, kind="stable")][:limit].tolist()
+
+    def row(self, i):
+        """Row i in the parse_stats layout, plus its total"""
+        row = {pretty_string(column): int(value) for column, value in zip(STAT_COLUMNS, self.stats[i])}
+        row["Total"] = int(self.total[i])
+        for slot, type in enumerate(self.types[i], 1):
+            row[f"Type {slot}"] = pretty_string(TYPE_NAMES[type]) if type != NO_TYPE else "None"
+        return row
+
+    @classmethod
+    def load(cls, base_url, path=None):
+        """Return the saved table for base_url, or None if missing or outdated"""
+        try:
+            with np.load(path or stat_table_path(), allow_pickle=False) as data:
+                if int(data["format"]) != STAT_TABLE_FORMAT or str(data["base_url"]) != base_url:
+                    return None
+                return cls(data["names"].tolist(), data["stats"], data["types"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def save(self, base_url, path=None):
+        """Atomically write the table so readers never see a partial file"""
+        path = path or stat_table_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".tmp.npz", delete=False) as f:
+            np.savez(
+                f, format=STAT_TABLE_FORMAT, base_url=base_url,
+                names=np.array(self.names, dtype=str), stats=self.stats, types=self.types
+            )
+        os.replace(f.name, path)
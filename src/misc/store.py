@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+from urllib.parse import parse_qsl
+from src.misc.cache import default_cache_dir
+from src.misc.lazy import LazyModule
+
+sqlite3 = LazyModule("sqlite3")
+
+def default_store_path():
+    return os.path.join(default_cache_dir(), "pokeapi.sqlite3")
+
+def split_endpoint(endpoint, params=None):
+    """Split 'pokemon?limit=5' style endpoints into ('pokemon', {'limit': '5'})"""
+    path, _, query = endpoint.strip("/").partition("?")
+    merged = dict(parse_qsl(query))
+    merged.update(params or {})
+    return path.strip("/"), merged
+
+class LocalStore:
+    """Indexed SQLite store of PokeAPI resources, used as an offline backend.
+
+    Resources are stored by endpoint ('pokemon/25' and 'pokemon/pikachu'), and
+    each resource family by its list endpoint ('pokemon') holding every entry,
+    which is sliced on read to answer limit/offset requests.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_store_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS resources (endpoint TEXT PRIMARY KEY, body BLOB NOT NULL)"
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def get(self, endpoint, params=None):
+        """Return the decoded resource for an endpoint, raising KeyError when it is not stored"""
+        path, params = split_endpoint(endpoint, params)
+        body = self.get_raw(path)
+        if body is None:
+            raise KeyError(f"{path} is not in the local store")
+        data = json.loads(body)
+        if "/" not in path and "results" in data:
+            # Answer a paginated list request from the full list
+            offset = int(params.get("offset", 0))
+            limit = int(params.get("limit", 20))
+            data["results"] = data["results"][offset:offset + limit]
+        return data
+
+    def get_raw(self, path):
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM resources WHERE endpoint = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, path, body):
+        """Store a resource body (bytes or decoded JSON) under its endpoint"""
+        if not isinstance(body, bytes):
+            body = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO resources VALUES (?, ?)", (path.strip("/"), body))
+
+    def put_resource(self, resource, data):
+        """Store a resource under its id and, when it has one, its name"""
+        body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self.put(f"{resource}/{data['id']}", body)
+        if data.get("name"):
+            self.put(f"{resource}/{data['name']}", body)
+
+    def import_dump(self, root):
+        """Bulk import a PokeAPI api-data checkout (data/api/v2/<resource>/<id>/index.json)"""
+        api_root = os.path.join(root, "data", "api", "v2")
+        if not os.path.isdir(api_root):
+            api_root = root
+        imported = 0
+        for resource in sorted(os.listdir(api_root)):
+            resource_dir = os.path.join(api_root, resource)
+            if not os.path.isdir(resource_dir):
+                continue
+            print(f"Importing {resource}...")
+            for entry in os.scandir(resource_dir):
+                index_path = os.path.join(entry.path, "index.json")
+                if entry.is_dir() and os.path.isfile(index_path):
+                    with open(index_path, encoding="utf-8") as f:
+                        data = json.load(f)
+                    if "id" in data:
+                        self.put_resource(resource, data)
+                        imported += 1
+            list_path = os.path.join(resource_dir, "index.json")
+            if os.path.isfile(list_path):
+                with open(list_path, "rb") as f:
+                    self.put(resource, f.read())
+        return imported
+
+    def import_cache(self, cache, base_url):
+        """Import responses cached by earlier online runs"""
+        lists = {}
+        imported = 0
+        for key, body in cache.items():
+            if not key.startswith(base_url):
+                continue
+            path, params = split_endpoint(key[len(base_url):])
+            data = json.loads(body)
+            if "/" in path:
+                self.put(path, body)
+                if isinstance(data, dict) and data.get("name") and data.get("id") is not None:
+                    resource = path.split("/")[0]
+                    self.put(f"{resource}/{data['id']}", body)
+                    self.put(f"{resource}/{data['name']}", body)
+                imported += 1
+            elif "results" in data:
+                # Merge cached pages of a list back into one full list
+                pages = lists.setdefault(path, {"count": data.get("count", 0), "pages": {}})
+                pages["pages"][int(params.get("offset", 0))] = data["results"]
+        for path, pages in lists.items():
+            results, seen = [], set()
+            for offset in sorted(pages["pages"]):
+                for item in pages["pages"][offset]:
+                    if item["name"] not in seen:
+                        seen.add(item["name"])
+                        results.append(item)
+            self.put(path, {"count": max(pages["count"], len(results)), "results": results})
+        return imported
@@ -0,0 +1,155 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.misc.lazy import LazyModule
+from src.misc.ratelimit import retry_after_seconds
+
+requests = LazyModule("requests")
+
+SYNC_FAMILIES = ("pokemon", "move", "ability", "machine", "version-group", "type")
+# Bump when the checkpoint layout changes so stale checkpoints are ignored
+SYNC_FORMAT = 1
+
+def checkpoint_path(store_path):
+    return f"{store_path}.sync.json"
+
+class Syncer:
+    """Mirrors whole PokeAPI resource families into a LocalStore.
+
+    Lists are crawled page by page, pages after the first in parallel, then
+    each resource is fetched by a bounded pool behind the client's rate limiter,
+    retry policy and circuit breaker.
+    Fetched resources and their ETags are checkpointed as they land, so an
+    interrupted sync resumes where it stopped. A family whose list count has
+    not changed since its last complete sync is skipped, and refresh=True
+    revalidates every stored resource with If-None-Match instead.
+    """
+    PAGE_SIZE = 200
+    CHECKPOINT_EVERY = 100
+
+    def __init__(self, client, store, workers=8):
+        self.client = client
+        self.store = store
+        self.workers = workers
+        self.path = checkpoint_path(store.path)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # One checkpoint write at a time
+        self._unsaved = 0
+        self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        if state.get("format") != SYNC_FORMAT or state.get("base_url") != self.client.base_url:
+            state = {"format": SYNC_FORMAT, "base_url": self.client.base_url, "families": {}}
+        return state
+
+    def save(self):
+        """Atomically write the checkpoint, workers checkpointing together write in turn"""
+        with self._save_lock:
+            with self._lock:
+                data = json.dumps(self.state, separators=(",", ":"))
+                self._unsaved = 0
+            directory = os.path.dirname(os.path.abspath(self.path))
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as f:
+                f.write(data)
+            os.replace(f.name, self.path)
+
+    def _get(self, endpoint, params=None, etag=None):
+        """Rate limited GET, returns (body or None when unchanged, etag).
+        Failures are retried by the client's policy, so a struggling API slows every caller."""
+        url = f"{self.client.base_url}/{endpoint}"
+        headers = {"If-None-Match": etag} if etag else None
+        policy, attempt = self.client.retry_policy, 0
+        while True:
+            try:
+                with self.client.metrics.label("sync"), self.client.metrics.request(endpoint, params) as record:
+                    response = self.client._send(url, params, headers)
+                    if response.status_code == 304:
+                        record.source = "revalidated"
+                    else:
+                        response.raise_for_status()
+                        record.size = len(response.content)
+                if response.status_code == 304:
+                    return None, etag
+                return response.content, response.headers.get("ETag")
+            except requests.RequestException as e:
+                if attempt >= policy.max_retries or not policy.retryable(e) or self.client.breaker.open:
+                    raise
+                attempt += 1
+                time.sleep(policy.delay(attempt, retry_after_seconds(e.response)))
+
+    def _crawl_list(self, family, executor):
+        """Every entry of a list endpoint, returns (count, results)"""
+        body, _ = self._get(family, {"limit": self.PAGE_SIZE, "offset": 0})
+        first = json.loads(body)
+        pages = executor.map(
+            self.client.metrics.bind(lambda offset: json.loads(self._get(family, {"limit": self.PAGE_SIZE, "offset": offset})[0])),
+            range(self.PAGE_SIZE, first["count"], self.PAGE_SIZE)
+        )
+        results = first["results"] + [entry for page in pages for entry in page["results"]]
+        return first["count"], results
+
+    def _sync_resource(self, family, path, etags, refresh):
+        """Fetch one resource into the store, returns True when its body changed"""
+        body, etag = self._get(path, etag=etags.get(path) if refresh else None)
+        if body is not None:
+            data = json.loads(body)
+            self.store.put(path, body)
+            if isinstance(data, dict) and data.get("name"):
+                self.store.put(f"{family}/{data['name']}", body)
+        with self._lock:
+            etags[path] = etag or ""
+            self._unsaved += 1
+            checkpoint = self._unsaved >= self.CHECKPOINT_EVERY
+        if checkpoint:
+            self.save()
+        return body is not None
+
+    def sync_family(self, family, executor, refresh=False):
+        """Mirror one family, returns {"Resources", "Fetched", "Unchanged", "Failed"}"""
+        count, results = self._crawl_list(family, executor)
+        state = self.state["families"].setdefault(family, {"count": 0, "complete": False, "etags": {}})
+        report = {"Resources": count, "Fetched": 0, "Unchanged": 0, "Failed": 0}
+        if state["complete"] and state["count"] == count and not refresh:
+            report["Unchanged"] = count
+            return report
+
+        self.store.put(family, {"count": count, "results": results})
+        state["count"], state["complete"] = count, False
+        etags = state["etags"]
+        paths = [f"{family}/{entry['url'].rstrip('/').split('/')[-1]}" for entry in results]
+        todo = paths if refresh else [path for path in paths if path not in etags]
+        report["Unchanged"] = len(paths) - len(todo)
+
+        def sync(path):
+            try:
+                return self._sync_resource(family, path, etags, refresh)
+            except requests.RequestException:
+                return None
+
+        for changed in executor.map(self.client.metrics.bind(sync), todo):
+            key = "Failed" if changed is None else "Fetched" if changed else "Unchanged"
+            report[key] += 1
+        state["complete"] = report["Failed"] == 0
+        return report
+
+    def run(self, families=SYNC_FAMILIES, refresh=False, verbose=True):
+        """Sync each family in turn, returns {family: report}. The checkpoint is saved even when interrupted."""
+        reports = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            for family in families:
+                if verbose:
+                    print(f"Syncing {family}...")
+                reports[family] = self.sync_family(family, executor, refresh)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.save()
+        return reports
@@ -0,0 +1,110 @@
+from src.misc.lazy import LazyModule
+
+np = LazyModule("numpy")
+
+# The 18 battle types, in PokeAPI id order
+TYPE_NAMES = (
+    "normal", "fighting", "flying", "poison", "ground", "rock", "bug", "ghost", "steel",
+    "fire", "water", "grass", "electric", "psychic", "ice", "dragon", "dark", "fairy"
+)
+NO_TYPE = len(TYPE_NAMES)  # Second type index of single type Pokemon
+
+class TypeChart:
+    """Type effectiveness as NumPy arrays, built once from the /type payloads.
+
+    chart[attacker, defender] is the damage multiplier of one type against
+    another. A defending type pairing is (type, second type or NO_TYPE), so the
+    multiplier against a Pokemon is chart[a, t1] * chart[a, t2]. The payloads
+    also list every Pokemon of each type, which gives the roster's types
+    without fetching any Pokemon.
+    """
+
+    def __init__(self, type_payloads):
+        index = {name: i for i, name in enumerate(TYPE_NAMES)}
+        # The extra all-ones column is the missing second type
+        chart = np.ones((NO_TYPE, NO_TYPE + 1))
+        roster = {}  # Pokemon name: [type index, type index or NO_TYPE]
+        for payload in type_payloads:
+            attacker = index.get(payload["name"])
+            if attacker is None:
+                continue
+            relations = payload["damage_relations"]
+            for key, multiplier in (("double_damage_to", 2.0), ("half_damage_to", 0.5), ("no_damage_to", 0.0)):
+                for defender in relations[key]:
+                    if defender["name"] in index:
+                        chart[attacker, index[defender["name"]]] = multiplier
+            for entry in payload.get("pokemon", ()):
+                slots = roster.setdefault(entry["pokemon"]["name"], [NO_TYPE, NO_TYPE])
+                slots[min(entry["slot"], 2) - 1] = attacker
+        self.chart = chart
+        self.index = index
+        self.roster = list(roster)
+        self.roster_types = np.array(list(roster.values()), dtype=np.intp).reshape(-1, 2)
+        self._roster_index = {name: i for i, name in enumerate(self.roster)}
+
+        # Every defending pairing once: pure types and each unordered pair of types
+        first, second = np.triu_indices(NO_TYPE + 1, k=1)
+        self.pairings = np.stack([first, second], axis=1)
+        # pairing_chart[attacker, pairing], with a zero row so NO_TYPE never attacks
+        self.pairing_chart = np.zeros((NO_TYPE + 1, len(first)))
+        self.pairing_chart[:NO_TYPE] = chart[:, first] * chart[:, second]
+
+    def type_pair(self, type_names):
+        """Type index pair for a list of type names, unknown types are dropped"""
+        pair = [self.index[name] for name in type_names if name in self.index][:2]
+        return tuple(pair + [NO_TYPE] * (2 - len(pair)))
+
+    def types_of(self, name):
+        """Type index pair of a Pokemon on the roster, or None"""
+        i = self._roster_index.get(name)
+        return None if i is None else tuple(self.roster_types[i])
+
+    def pair_name(self, pair):
+        return "/".join(TYPE_NAMES[t] for t in pair if t != NO_TYPE)
+
+    def defense(self, types):
+        """Multipliers taken from each attacking type, one row per (t1, t2) row of types"""
+        return (self.chart[:, types[:, 0]] * self.chart[:, types[:, 1]]).T
+
+    def offense(self, types):
+        """Best multiplier the types' STAB moves get against every pairing, one row per row of types"""
+        return np.maximum(self.pairing_chart[types[:, 0]], self.pairing_chart[types[:, 1]])
+
+    def coverage(self, team_types):
+        """Defensive weaknesses and offensive coverage of a team, given one type pair per member"""
+        team = np.array(team_types, dtype=np.intp).reshape(-1, 2)
+        defense = self.defense(team)
+        best = self.offense(team).max(axis=0)
+        return {
+            "defense": defense,
+            "weak": (defense > 1).sum(axis=0),
+            "resist": (defense < 1).sum(axis=0),
+            "covered": int((best > 1).sum()),
+            "resisted": [self.pair_name(pair) for pair in self.pairings[best < 1]]
+        }
+
+    def rank_teammates(self, team_types, limit=10, exclude=()):
+        """Roster Pokemon that best patch a team, as (name, resists, shared, new coverage) tuples.
+
+        resists counts the team's net weaknesses the candidate resists, shared
+        those it is weak to as well, and new coverage the pairings its STAB
+        types hit super effectively that the team could not. Every candidate
+        is scored at once against the whole roster's type arrays.
+        """
+        team = np.array(team_types, dtype=np.intp).reshape(-1, 2)
+        defense = self.defense(team)
+        weak = (defense > 1).sum(axis=0) > (defense < 1).sum(axis=0)
+        team_covered = self.offense(team).max(axis=0) > 1
+
+        candidates = self.defense(self.roster_types)[:, weak]
+        resists = (candidates < 1).sum(axis=1)
+        shared = (candidates > 1).sum(axis=1)
+        new_coverage = ((self.offense(self.roster_types) > 1) & ~team_covered).sum(axis=1)
+
+        keep = np.ones(len(self.roster), dtype=bool)
+        keep[[self._roster_index[name] for name in exclude if name in self._roster_index]] = False
+        keep = np.flatnonzero(keep)
+        # Best defensive patch first, new coverage breaks ties
+        score = resists - shared
+        order = keep[np.lexsort((-new_coverage[keep], -score[keep]))][:limit]
+        return [(self.roster[i], int(resists[i]), int(shared[i]), int(new_coverage[i])) for i in order]
@@ -1,43 +1,273 @@
-import yaml
-from colorama import init, Fore, Style
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 
-init(autoreset=True)
+@lru_cache(maxsize=None)
+def _colors():
+    """Import and initialise colorama on first colored output, returns (Fore, Style)"""
+    from colorama import init, Fore, Style
+    init(autoreset=True)
+    return Fore, Style
+
+# Per thread sink that receives printed data as records instead of text
+_capture = threading.local()
+
+@contextmanager
+def capture_output():
+    """Collect the data passed to the pretty printers on this thread instead of printing it"""
+    previous = getattr(_capture, "records", None)
+    records = _capture.records = []
+    try:
+        yield records
+    finally:
+        _capture.records = previous
+
+def _emit(kind, data, title=""):
+    """Hand data to the capture sink, returns False when nothing is capturing"""
+    records = getattr(_capture, "records", None)
+    if records is None:
+        return False
+    records.append({"type": kind, "title": title, "data": data})
+    return True
+
+class ThreadStdout:
+    """Stdout proxy that sends writes to a per thread buffer while a job runs"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
 
 def pretty_print_list(items, columns=5):
     sorted_items = sorted(items)
+    if _emit("list", sorted_items):
+        return
     
     # Calculate the number of rows needed
     num_rows = (len(sorted_items) + columns - 1) // columns
     
-    # Print the items in a grid format
-    print()
+    # Print the items in a grid format, one write per row
+    write = sys.stdout.write
+    write("\n")
     for row in range(num_rows):
-        row_items = []
-        for col in range(columns):
-            index = row + col * num_rows
-            if index < len(sorted_items):
-                row_items.append(f"{sorted_items[index]:<25}")
-        print(" ".join(row_items))
-    print()
+        write(" ".join(f"{item:<25}" for item in sorted_items[row::num_rows]) + "\n")
+    write("\n")
 
+@lru_cache(maxsize=4096)
 def pretty_string(string):
     """Convert a string from 'name_test' to 'Name Test'."""
     string = string.replace("-", " ").replace("_", " ")
     return ' '.join(word.capitalize() for word in string.split())
 
-def rename_dict(d):
-    """Recursively rename only the string keys in a dictionary."""
-    if isinstance(d, dict):
-        return {rename_dict(pretty_string(k)): rename_dict(v) for k, v in d.items()}
-    elif isinstance(d, list):
-        return [rename_dict(item) for item in d]
+class _Lines(list):
+    """Rendered lines that track their widest line as they are appended"""
+
+    def __init__(self):
+        super().__init__()
+        self.width = 0
+
+    def add(self, line):
+        self.append(line)
+        if len(line) > self.width:
+            # Unicode line separators written inside quotes also end a line
+            self.width = max(self.width, *map(len, line.splitlines()))
+
+# Plain strings YAML would read back as another type, or whose first character is an indicator
+_YAML_IMPLICIT = re.compile(
+    r"^(?:~|null|Null|NULL|yes|Yes|YES|no|No|NO|true|True|TRUE|false|False|FALSE|on|On|ON|off|Off|OFF"
+    r"|[-+]?[0-9][0-9_]*\.[0-9_]*(?:[eE][-+][0-9]+)?|\.[0-9][0-9_]*(?:[eE][-+][0-9]+)?"
+    r"|[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN)"
+    r"|[-+]?0b[0-1_]+|[-+]?0[0-7_]+|[-+]?(?:0|[1-9][0-9_]*)|[-+]?0x[0-9a-fA-F_]+|[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+"
+    r"|[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}(?:(?:[Tt]|[ \t]+)[0-9].*)?|<<|=)$"
+)
+_YAML_INDICATORS = "#,[]{}&*!|>'\"%@`"
+# Characters YAML escapes in double quotes, line breaks and breaks next to a space
+_YAML_SPECIAL = re.compile("[^\n\x20-\x7e\x85\xa0-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010fffe]")
+_YAML_BREAKS = "\n\x85\u2028\u2029"
+_YAML_SPACES = " " + _YAML_BREAKS
+# Plain text folds only at a single space
+_YAML_FOLD = re.compile("(?<! ) (?! )")
+# Text without special characters or line breaks, the usual case
+_YAML_ORDINARY = re.compile("[\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010fffe]*")
+_YAML_SPACED_BREAK = re.compile(f" [{_YAML_BREAKS}]|[{_YAML_BREAKS}] ")
+_YAML_ESCAPES = {
+    "\0": "0", "\x07": "a", "\x08": "b", "\t": "t", "\n": "n", "\x0b": "v", "\x0c": "f", "\r": "r",
+    "\x1b": "e", '"': '"', "\\": "\\", "\x85": "N", "\xa0": "_", "\u2028": "L", "\u2029": "P"
+}
+# What double quotes write as is, everything else is escaped
+_YAML_DOUBLE_PLAIN = re.compile("[\x20-\x7e\xa0-\ud7ff\ue000-\ufefe\uff00-\ufffd]")
+
+def _needs_quotes(text):
+    """Whether YAML would quote a string instead of writing it plain"""
+    return (
+        _YAML_IMPLICIT.match(text) is not None
+        or text[0] in _YAML_INDICATORS
+        or (text[0] in "-?:" and (len(text) == 1 or text[1] == " "))
+        or text[0] in _YAML_SPACES or text[-1] in _YAML_SPACES
+        or text.endswith(":")
+        or text.startswith(("---", "..."))
+        or ": " in text or " #" in text
+    )
+
+def _quote_style(text):
+    """The quotes YAML writes a string in: '"' when it needs escapes, "'" when it cannot be plain, else ''"""
+    if _YAML_ORDINARY.fullmatch(text):
+        return "'" if _needs_quotes(text) else ""
+    # Past the fast path the text holds a special character or a line break
+    return '"' if _YAML_SPECIAL.search(text) or _YAML_SPACED_BREAK.search(text) else "'"
+
+def _single_quoted(text, column, indent, width):
+    """text in single quotes written from column, folded at spaces and breaks like YAML does"""
+    out = ["'"]
+    column += 1
+    start = end = 0
+    spaces = breaks = False
+    while end <= len(text):
+        ch = text[end] if end < len(text) else None
+        if spaces:
+            if ch != " ":
+                if start + 1 == end and column > width and start != 0 and end != len(text):
+                    out.append("\n" + " " * indent)
+                    column = indent
+                else:
+                    out.append(text[start:end])
+                    column += end - start
+                start = end
+        elif breaks:
+            if ch is None or ch not in _YAML_BREAKS:
+                # A lone break would fold into a space, so line feeds get an extra one
+                if text[start] == "\n":
+                    out.append("\n")
+                out.append(text[start:end] + " " * indent)
+                column = indent
+                start = end
+        elif ch is None or ch in " '" or ch in _YAML_BREAKS:
+            out.append(text[start:end])
+            column += end - start
+            start = end
+        if ch == "'":
+            out.append("''")
+            column += 2
+            start = end + 1
+        if ch is not None:
+            spaces, breaks = ch == " ", ch in _YAML_BREAKS
+        end += 1
+    out.append("'")
+    return "".join(out)
+
+def _double_quoted(text, column, indent, width):
+    """text in double quotes with YAML's escapes, written from column and folded with a trailing backslash"""
+    out = ['"']
+    column += 1
+    start = end = 0
+    while end <= len(text):
+        ch = text[end] if end < len(text) else None
+        if ch is None or ch in '"\\\u2028\u2029' or not _YAML_DOUBLE_PLAIN.match(ch):
+            out.append(text[start:end])
+            column += end - start
+            start = end
+            if ch is not None:
+                code = ord(ch)
+                escape = ("\\" + _YAML_ESCAPES[ch] if ch in _YAML_ESCAPES
+                          else f"\\x{code:02X}" if code <= 0xFF
+                          else f"\\u{code:04X}" if code <= 0xFFFF else f"\\U{code:08X}")
+                out.append(escape)
+                column += len(escape)
+                start = end + 1
+        if 0 < end < len(text) - 1 and (ch == " " or start >= end) and column + end - start > width:
+            out.append(text[start:end] + "\\\n" + " " * indent)
+            column = indent
+            start = max(start, end)
+            if text[start] == " ":
+                out.append("\\")
+                column += 1
+        end += 1
+    out.append('"')
+    return "".join(out)
+
+def _scalar(value):
+    """YAML style text for a leaf value other than a string YAML would quote"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, dict):
+        return "{}"
+    if isinstance(value, list):
+        return "[]"
+    if value == "":
+        return "''"
+    return str(value)
+
+def _add_wrapped(lines, prefix, value, indent, width=70):
+    """Add prefix + value, quoting and folding text past width like YAML does"""
+    style = _quote_style(value) if isinstance(value, str) and value else ""
+    if style:
+        write = _double_quoted if style == '"' else _single_quoted
+        for line in (prefix + write(value, len(prefix), indent, width)).split("\n"):
+            lines.add(line)
+        return
+    text = _scalar(value)
+    if not isinstance(value, str) or len(prefix) + len(text) <= width:
+        lines.add(prefix + text)
+        return
+    line = prefix
+    words = _YAML_FOLD.split(text)
+    for i, word in enumerate(words):
+        if i and len(line) > width:
+            lines.add(line)
+            line = " " * indent + word
+        else:
+            line += (" " if i else "") + word
+    lines.add(line)
+
+def _render(value, indent, lines):
+    """Walk a structure once, adding YAML style lines with prettified, sorted keys"""
+    pad = " " * indent
+    if isinstance(value, dict) and value:
+        items = sorted(
+            ((pretty_string(key) if isinstance(key, str) else key, item) for key, item in value.items()),
+            key=lambda pair: str(pair[0])
+        )
+        for key, item in items:
+            if isinstance(item, dict) and item:
+                lines.add(f"{pad}{key}:")
+                _render(item, indent + 4, lines)
+            elif isinstance(item, list) and item:
+                lines.add(f"{pad}{key}:")
+                _render(item, indent, lines)
+            else:
+                _add_wrapped(lines, f"{pad}{key}: ", item, indent + 4)
+    elif isinstance(value, list) and value:
+        for item in value:
+            if isinstance(item, (dict, list)) and item:
+                nested = _Lines()
+                _render(item, indent + 4, nested)
+                lines.add(f"{pad}-   {nested[0][indent + 4:]}")
+                for line in nested[1:]:
+                    lines.add(line)
+            else:
+                _add_wrapped(lines, f"{pad}- ", item, indent + 4)
     else:
-        return d
-    
+        _add_wrapped(lines, pad, value, indent)
+
 def pretty_print_dict(d, message=""):
-    d = rename_dict(d)
-    dict_string = yaml.dump(d, width=70, allow_unicode=True, indent=4).rstrip()
-    max_len = max((len(line) for line in dict_string.splitlines()), default=0)
+    if _emit("dict", d, pretty_string(message)):
+        return
+    lines = _Lines()
+    _render(d, 0, lines)
+    max_len = lines.width
     if message:
         message = pretty_string(message)
         max_len = max(max_len, len(message) + 4)
@@ -45,11 +275,17 @@ def pretty_print_dict(d, message=""):
     else:
         header = '-' * max_len
     footer = '-' * max_len
-    print(header)
-    print(dict_string)
-    print(footer)
+    lines.append(footer)
+    sys.stdout.write(f"{header}\n" + "\n".join(lines) + "\n")
+
+def pretty_error(msg):
+    """Print an error, captured output records it as a failure"""
+    _emit("error", msg)
+    print(msg)
 
 def pretty_message(msg, num=70):
+    if _emit("message", msg):
+        return
     print("-"*num)
     print(msg)
     print("-"*num)
@@ -57,6 +293,7 @@ def pretty_message(msg, num=70):
 def highlight_value(value, high, low, width):
     if not isinstance(value, (int, float)):
         return str(value).ljust(width)
+    Fore, Style = _colors()
     color = (
         Fore.YELLOW if (value == high and value == low) else
         Fore.GREEN if value == high else
@@ -64,12 +301,22 @@ def highlight_value(value, high, low, width):
     )
     return f"{color}{str(value).ljust(width)}{Style.RESET_ALL}" 
 
-def pretty_compare(stats_dict):
+def _cell_lines(value, width):
+    """A table cell as lines of at most width, text that does not fit wraps at spaces"""
+    if isinstance(value, (int, float)) or len(str(value)) <= width:
+        return [value]
+    import textwrap
+    return textwrap.wrap(str(value), width) or [""]
+
+def pretty_compare(stats_dict, title="Base Stats"):
+    """Print a table with a column per key of stats_dict, long text wraps within its column"""
+    if _emit("table", stats_dict, title):
+        return
     pokemons = list(stats_dict.keys())
     stats = next(iter(stats_dict.values())).keys()
     col_width = max(max(len(p) for p in pokemons), 8)
 
-    header = f"{'Base Stats'.ljust(15)} | {' | '.join(p.ljust(col_width) for p in pokemons)}"
+    header = f"{title.ljust(15)} | {' | '.join(p.ljust(col_width) for p in pokemons)}"
     print(f"{header}\n{'-' * len(header)}")
 
     for stat in stats:
@@ -77,7 +324,10 @@ def pretty_compare(stats_dict):
         numeric_values = [v for v in values if isinstance(v, (int, float))]
         high, low = (max(numeric_values), min(numeric_values)) if numeric_values else (None, None)
 
-        row = f"{stat.ljust(15)} | " + " | ".join(
-            highlight_value(stats_dict[p][stat], high, low, col_width) for p in pokemons
-        )
-        print(row)
\ No newline at end of file
+        cells = [_cell_lines(value, col_width) for value in values]
+        for i in range(max(len(lines) for lines in cells)):
+            row = f"{(stat if i == 0 else '').ljust(15)} | " + " | ".join(
+                highlight_value(lines[i], high, low, col_width) if i < len(lines) else " " * col_width
+                for lines in cells
+            )
+            print(row)
\ No newline at end of file
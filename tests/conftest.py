@@ -0,0 +1,65 @@
+import json
+import pytest
+import requests
+from bench.transport import ReplayAdapter
+from src.misc.client import PokeApiClient
+
+REPLAY_HOST = "http://replay.invalid/"
+BASE_URL = f"{REPLAY_HOST}api/v2"
+
+def pokemon_payload(id, name, stats, types, abilities=("static",)):
+    """A /pokemon payload with only the fields the client reads"""
+    stat_names = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+    return {
+        "id": id, "name": name,
+        "stats": [{"base_stat": value, "stat": {"name": stat}} for stat, value in zip(stat_names, stats)],
+        "types": [{"slot": slot, "type": {"name": type}} for slot, type in enumerate(types, 1)],
+        "abilities": [{"ability": {"name": ability}, "slot": 1, "is_hidden": False} for ability in abilities],
+        "moves": []
+    }
+
+def api_fixtures():
+    """{fixture key: body} for a tiny PokeAPI"""
+    pokemon = {
+        "pikachu": pokemon_payload(25, "pikachu", (35, 55, 40, 50, 50, 90), ("electric",)),
+        "gengar": pokemon_payload(94, "gengar", (60, 65, 60, 130, 75, 110), ("ghost", "poison"), ("cursed-body",)),
+        "snorlax": pokemon_payload(143, "snorlax", (160, 110, 65, 65, 110, 30), ("normal",), ("immunity",)),
+    }
+    data = {
+        "pokemon?limit=100&offset=0": {"count": len(pokemon), "results": [
+            {"name": name, "url": f"{BASE_URL}/pokemon/{payload['id']}/"} for name, payload in pokemon.items()
+        ]},
+        "version-group?limit=100": {"count": 1, "results": [{"name": "scarlet-violet", "url": ""}]},
+        "ability/static": {"flavor_text_entries": [
+            {"flavor_text": "May paralyze on contact.", "language": {"name": "en"}, "version_group": {"name": "scarlet-violet"}}
+        ]},
+    }
+    data.update({f"pokemon/{name}": payload for name, payload in pokemon.items()})
+    return {key: json.dumps(body).encode() for key, body in data.items()}
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path, monkeypatch):
+    """Keep every cache, snapshot and index of a test in its own directory"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path
+
+@pytest.fixture
+def replay():
+    return ReplayAdapter(api_fixtures(), latency=0.05)
+
+@pytest.fixture
+def make_client(replay):
+    """Build clients whose requests are answered by the replay adapter, or another adapter"""
+    clients = []
+
+    def make(adapter=None, **kwargs):
+        session = requests.Session()
+        session.mount(REPLAY_HOST, adapter or replay)
+        kwargs.setdefault("interactive", False)
+        client = PokeApiClient(BASE_URL, session=session, **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.executor.shutdown(wait=False)
@@ -0,0 +1,24 @@
+import io
+import json
+from src.context.batch import BatchRunner
+
+def run_batch(client, script):
+    out = io.StringIO()
+    BatchRunner(client, jobs=2, out=out).run(script.splitlines())
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+def test_refused_commands_are_errors(make_client):
+    records = run_batch(make_client(), "choose pikachu\nabilities\nexit\n")
+    assert [record["command"] for record in records] == ["choose pikachu", "abilities", "exit"]
+    refused = records[1]
+    assert not refused["ok"]
+    assert "version" in refused["errors"][0]
+    assert records[0]["ok"] and records[2]["ok"]
+
+def test_every_line_after_a_failed_choose_gets_a_record(make_client):
+    records = run_batch(make_client(), "choose missingno\nstats\nversion scarlet-violet\nexit\n# done\nsearch pika\n")
+    assert [record["command"] for record in records] == [
+        "choose missingno", "stats", "version scarlet-violet", "exit", "search pika"
+    ]
+    assert [record["ok"] for record in records] == [False, False, False, False, True]
+    assert records[1]["errors"] == ["Skipped, 'choose missingno' failed"]
@@ -0,0 +1,79 @@
+import time
+import pytest
+from bench.transport import ReplayAdapter
+from src.misc import cache as cache_module
+from src.misc.cache import DAY, LIST_TTL, MemoryCache, ResponseCache, cache_key
+
+class Clock:
+    """Stands in for the time module in src.misc.cache"""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+class ETagAdapter(ReplayAdapter):
+    """Replay that tags bodies with an ETag and answers 304 when it still matches"""
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        etag = f'"{hash(response.content)}"'
+        if request.headers.get("If-None-Match") == etag:
+            response.status_code, response._content = 304, b""
+        response.headers["ETag"] = etag
+        return response
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+def test_ttls_by_family():
+    cache = ResponseCache(":memory:", ttls={"berry": DAY})
+    assert cache.ttl_for("pokemon/pikachu") == 30 * DAY
+    assert cache.ttl_for("berry/cheri") == DAY
+    assert cache.ttl_for("pokemon", {"limit": 20}) == cache.ttl_for("pokemon?limit=20") == LIST_TTL
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ResponseCache(":memory:")
+    cache.put("key", b"body", ttl=60, etag='"1"')
+    assert cache.get("key").fresh
+    clock.now += 61
+    entry = cache.get("key")
+    assert not entry.fresh and entry.body == b"body"  # Stale entries stay for revalidation
+    assert entry.validators() == {"If-None-Match": '"1"'}
+    cache.touch("key", 60)
+    assert cache.get("key").fresh
+
+def test_disk_cache_evicts_least_recently_used(clock):
+    cache = ResponseCache(":memory:", max_bytes=100)
+    for key in "abc":
+        cache.put(key, b"x" * 30, ttl=60)
+        clock.now += 1
+    cache.get("a")  # Now the most recently used
+    clock.now += 1
+    cache.put("d", b"x" * 30, ttl=60)
+    assert [key for key, _ in cache.items()] == ["a", "c", "d"]
+
+def test_memory_cache_evicts_least_recently_used():
+    memory = MemoryCache(max_items=2)
+    memory.put("a", b"1")
+    memory.put("b", b"2")
+    memory.get("a")
+    memory.put("c", b"3")
+    assert "b" not in memory and memory.get("a") == b"1" and memory.get("c") == b"3"
+
+def test_stale_entry_is_revalidated_with_its_etag(make_client, replay, clock):
+    etags = ETagAdapter(replay.fixtures)
+    client = make_client(etags)
+    assert client.get_pokemon("pikachu")["id"] == 25
+    key = cache_key(f"{client.base_url}/pokemon/pikachu")
+    clock.now += client.cache.ttl_for("pokemon/pikachu") + 1
+
+    fresh = make_client(etags)  # Nothing in memory, a stale entry on disk
+    assert fresh.get_pokemon("pikachu")["id"] == 25
+    assert etags.counts["pokemon/pikachu"] == 2
+    assert fresh.metrics.endpoint_report()["pokemon"]["Network"] == 0  # Answered by a 304
+    assert fresh.cache.get(key).fresh
@@ -0,0 +1,17 @@
+from src.misc.util import pretty_compare
+
+def test_long_text_wraps_within_its_column(capsys):
+    pretty_compare({
+        "pichu": {"Stage": 1, "Evolves By": "Base"},
+        "pikachu": {"Stage": 2, "Evolves By": "Friendship"},
+        "raichu": {"Stage": 3, "Evolves By": "Use Thunder Stone"},
+    }, "Evolution")
+    lines = capsys.readouterr().out.splitlines()
+    header = lines[0]
+    separators = [i for i, c in enumerate(header) if c == "|"]
+    rows = lines[2:]
+    assert len(rows) > 2
+    for row in rows:
+        assert len(row) == len(header)
+        assert [i for i, c in enumerate(row) if c == "|"] == separators
+    assert "Use" in rows[1] and "Stone" in rows[-1]
@@ -0,0 +1,37 @@
+import threading
+import time
+import pytest
+from src.misc.daemon import DaemonClient, PokedexDaemon
+
+@pytest.fixture
+def daemon(make_client, tmp_path):
+    server = PokedexDaemon(make_client(use_cache=False), str(tmp_path / "daemon.sock"))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_command_report_is_per_session(daemon):
+    first, second = DaemonClient(daemon.path), DaemonClient(daemon.path)
+    with first.metrics.command("stats"):
+        first.get_stats("pikachu")
+    with second.metrics.command("stats"):
+        # A concurrent wave, its requests are made on the daemon's worker threads
+        second.get_stats_many(["gengar", "snorlax"])
+    assert first.metrics.command_report()["stats"]["Requests"] == 1
+    assert second.metrics.command_report()["stats"]["Requests"] == 2
+    assert second.metrics.command_report()["stats"]["Runs"] == 1
+    second.metrics.reset()
+    assert second.metrics.command_report() == {}
+    assert first.metrics.command_report()["stats"]["Requests"] == 1
+
+def test_cancel_prefetch_keeps_other_sessions_queues(daemon, replay):
+    first, second = DaemonClient(daemon.path), DaemonClient(daemon.path)
+    endpoints = ["pokemon/pikachu", "pokemon/gengar", "pokemon/snorlax"]
+    first.prefetch(endpoints)
+    second.prefetch(["ability/static"])
+    second.cancel_prefetch()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and not all(replay.counts[endpoint] for endpoint in endpoints):
+        time.sleep(0.05)
+    assert all(replay.counts[endpoint] == 1 for endpoint in endpoints)
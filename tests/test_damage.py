@@ -0,0 +1,61 @@
+import numpy as np
+from src.misc.damage import MoveTable, battle_stats, damage_rolls, move_in_version
+from src.misc.stattable import StatTable
+from src.misc.typechart import TYPE_NAMES, NO_TYPE, TypeChart
+
+def relations(double=(), half=(), none=()):
+    return {"double_damage_to": [{"name": t} for t in double], "half_damage_to": [{"name": t} for t in half],
+            "no_damage_to": [{"name": t} for t in none]}
+
+CHART = TypeChart([
+    {"name": "electric", "damage_relations": relations(double=("water", "flying"))},
+    {"name": "normal", "damage_relations": relations(none=("ghost",))},
+    {"name": "dark", "damage_relations": relations(double=("ghost",))},
+    {"name": "grass", "damage_relations": relations(half=("fire", "flying"))},
+])
+
+def table(*pokemon):
+    """StatTable from (name, base stats, types) rows"""
+    types = [[TYPE_NAMES.index(t) for t in types] + [NO_TYPE] * (2 - len(types)) for _, _, types in pokemon]
+    return StatTable([name for name, _, _ in pokemon], [stats for _, stats, _ in pokemon], types)
+
+PIKACHU = ("pikachu", (35, 55, 40, 50, 50, 90), ("electric",))
+SNORLAX = ("snorlax", (160, 110, 65, 65, 110, 30), ("normal",))
+GYARADOS = ("gyarados", (95, 125, 79, 60, 100, 81), ("water", "flying"))
+GENGAR = ("gengar", (60, 65, 60, 130, 75, 110), ("ghost", "poison"))
+CHARIZARD = ("charizard", (78, 84, 78, 109, 85, 100), ("fire", "flying"))
+
+def test_battle_stats_at_level_50():
+    assert battle_stats(table(PIKACHU, GYARADOS).stats).tolist() == [
+        [110, 75, 60, 70, 70, 110],
+        [170, 145, 99, 80, 120, 101],
+    ]
+
+def test_stab_super_effective_special_rolls():
+    # 90 power STAB Thunderbolt from 70 Sp. Atk into 120 Sp. Def: base 25, each roll x1.5 then x4
+    rolls, hp = damage_rolls(table(PIKACHU), MoveTable({"thunderbolt": {"power": 90, "type": "electric", "damage_class": "special"}}),
+                             table(GYARADOS), CHART)
+    assert rolls[0, 0].tolist() == [124, 124, 124, 132, 132, 132, 132, 136, 136, 136, 136, 144, 144, 144, 144, 148]
+    assert hp.tolist() == [170]
+
+def test_physical_rolls_immunity_and_minimum_damage():
+    moves = MoveTable({
+        "crunch": {"power": 80, "type": "dark", "damage_class": "physical"},
+        "body-slam": {"power": 85, "type": "normal", "damage_class": "physical"},
+        "weak": {"power": 10, "type": "grass", "damage_class": "special"},
+        "growl": {"power": None, "type": "normal", "damage_class": "status"},
+    })
+    assert moves.names == ["crunch", "body-slam", "weak"]
+    rolls, _ = damage_rolls(table(SNORLAX), moves, table(GENGAR, CHARIZARD), CHART)
+    # 130 Attack into 80 Defense, base 59, super effective without STAB
+    assert rolls[0, 0].tolist() == [100, 100, 102, 102, 104, 106, 106, 108, 108, 110, 112, 112, 114, 114, 116, 118]
+    assert not rolls[1, 0].any()  # Ghosts are immune to normal moves
+    assert rolls[2, 1].tolist() == [1] * 16  # A quarter of 3 or 4 still does 1
+
+def test_move_in_version_uses_earliest_later_change():
+    move = {"power": 40, "type": "fairy", "damage_class": "special", "past": [("x-y", None, "normal"), ("b-w", 35, None)]}
+    orders = {"b-w": (5, 11), "x-y": (6, 15)}
+    assert move_in_version(move, (6, 15), orders) == {"power": 40, "type": "fairy", "damage_class": "special"}
+    assert move_in_version(move, (5, 11), orders) == {"power": 40, "type": "normal", "damage_class": "special"}
+    # Before the physical/special split the type decides the class
+    assert move_in_version(move, (3, 5), orders) == {"power": 35, "type": "normal", "damage_class": "physical"}
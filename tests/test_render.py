@@ -0,0 +1,37 @@
+import pytest
+from src.misc.util import pretty_print_dict, pretty_string
+
+yaml = pytest.importorskip("yaml")
+
+def prettified(value):
+    if isinstance(value, dict):
+        return {pretty_string(key) if isinstance(key, str) else key: prettified(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [prettified(item) for item in value]
+    return value
+
+def yaml_block(d, message):
+    """The block pretty_print_dict printed when it went through yaml.dump"""
+    text = yaml.dump(prettified(d), width=70, allow_unicode=True, indent=4).rstrip("\n")
+    width = max((len(line) for line in text.splitlines()), default=0)
+    message = pretty_string(message)
+    width = max(width, len(message) + 4)
+    return f"{message.center(width, '-')}\n{text}\n{'-' * width}\n"
+
+FLAVOR = "When several of\nthese POKéMON\ngather, their\felectricity could\nbuild and cause\nlightning storms."
+LONG = "Inflicts regular damage.  Has a 10% chance to paralyze the target, " * 3
+
+@pytest.mark.parametrize("d", [
+    {},
+    {"perf": {}, "events": [], "none": None, "flag": True, "empty": ""},
+    {"tab": "a\tb", "form-feed": "a\fb", "soft-hyphen": "soft\xadhyphen", "nul": "x\0y", "bell": "bell\x07"},
+    {"del": "del\x7f", "bom": "﻿bom", "trailing-tab": "tab\t", "quote-tab": "it's\t\"here\"", "emoji": "🙂 ok"},
+    {"separator": "a b", "next-line": "a\x85b", "space-break": "a \nb", "nbsp": "\xa0edge\xa0"},
+    {"flavor-text": FLAVOR, "entries": [FLAVOR, {"text": FLAVOR.replace("\f", "\n")}]},
+    {"effect": LONG, "quoted": "'" + LONG, "escaped": LONG.replace(",", "\t"), "nested": {"effect": LONG}},
+    {"implicit": ["yes", "No", "1e3", "12:30", "09", "0x1f", "~", "---", "- x", "a: b", "x #y", "#tag", "@at"]},
+    {"moves": [{"name": "thunderbolt", "power": 90, "past": [{"power": 95}]}, [1, [2, 3]], []]},
+], ids=lambda d: ",".join(d) or "empty")
+def test_matches_yaml_dump(d, capsys):
+    pretty_print_dict(d, "report")
+    assert capsys.readouterr().out == yaml_block(d, "report")
@@ -0,0 +1,116 @@
+import random
+import time
+import pytest
+import requests
+from email.utils import formatdate
+from bench.fixtures import fixture_key
+from bench.transport import ReplayAdapter
+from src.misc.ratelimit import RateLimiter, retry_after_seconds
+from src.misc.retry import CircuitBreaker, RetryPolicy
+
+class FlakyAdapter(ReplayAdapter):
+    """Replay that first answers some keys with error statuses, one per request"""
+
+    def __init__(self, fixtures, failures):
+        super().__init__(fixtures)
+        self.failures = {key: list(statuses) for key, statuses in failures.items()}
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        statuses = self.failures.get(fixture_key(request.url))
+        if statuses:
+            response.status_code, response._content = statuses.pop(0), b"Unavailable"
+        return response
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+def response_with(headers):
+    response = requests.Response()
+    response.headers.update(headers)
+    return response
+
+@pytest.fixture
+def flaky(replay, make_client):
+    """make(failures) -> (client, adapter), with retries that barely wait"""
+    def make(failures, **kwargs):
+        adapter = FlakyAdapter(replay.fixtures, failures)
+        kwargs.setdefault("retry_policy", RetryPolicy(base_delay=0.001, max_delay=0.01))
+        return make_client(adapter, use_cache=False, **kwargs), adapter
+    return make
+
+def test_retryable_errors():
+    policy = RetryPolicy()
+    assert policy.retryable(requests.ConnectionError()) and policy.retryable(requests.Timeout())
+    assert policy.retryable(http_error(429)) and policy.retryable(http_error(503))
+    assert not policy.retryable(http_error(404))
+    assert not policy.retryable(requests.exceptions.SSLError())
+
+def test_backoff_is_jittered_capped_and_honours_retry_after():
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+    random.seed(0)
+    for attempt in range(1, 8):
+        assert 0 <= policy.delay(attempt) <= min(4.0, 0.5 * 2 ** (attempt - 1))
+    assert policy.delay(1, retry_after=3) == 3
+    assert policy.delay(1, retry_after=60) == 4.0  # The server cannot stall us past max_delay
+
+def test_retry_after_header():
+    assert retry_after_seconds(response_with({"Retry-After": "7"})) == 7.0
+    assert 8 <= retry_after_seconds(response_with({"Retry-After": formatdate(time.time() + 10, usegmt=True)})) <= 10
+    assert retry_after_seconds(response_with({"Retry-After": "soon"})) is None
+    assert retry_after_seconds(response_with({})) is None
+    assert retry_after_seconds(None) is None
+
+def test_server_errors_are_retried(flaky):
+    client, adapter = flaky({"pokemon/pikachu": [503, 429]})
+    assert client.get_pokemon("pikachu")["id"] == 25
+    assert adapter.counts["pokemon/pikachu"] == 3
+    assert client.metrics.events["retries"] == 2
+
+def test_client_errors_are_not_retried(flaky):
+    client, adapter = flaky({})
+    with pytest.raises(requests.HTTPError):
+        client.get_pokemon("missingno")
+    assert adapter.counts["pokemon/missingno"] == 1
+
+def test_retries_give_up(flaky):
+    client, adapter = flaky({"pokemon/pikachu": [500] * 10})
+    with pytest.raises(requests.HTTPError):
+        client.get_pokemon("pikachu")
+    assert adapter.counts["pokemon/pikachu"] == 1 + client.retry_policy.max_retries
+
+def test_breaker_fails_fast_then_lets_a_trial_through(flaky):
+    client, adapter = flaky({"pokemon/pikachu": [500, 500]}, retry_policy=RetryPolicy(max_retries=0))
+    client.breaker = CircuitBreaker(threshold=2, cooldown=0.2)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.get_pokemon("pikachu")
+    assert client.breaker.open
+    with pytest.raises(requests.ConnectionError, match="paused"):
+        client.get_pokemon("gengar")
+    assert adapter.counts["pokemon/gengar"] == 0
+    time.sleep(0.2)
+    assert client.get_pokemon("pikachu")["id"] == 25  # The trial succeeds and closes the breaker
+    assert not client.breaker.open and client.breaker.failures == 0
+
+def test_throttling_halves_the_rate_and_pauses_for_retry_after():
+    limiter = RateLimiter(rate=1000.0)
+    limiter.throttled(retry_after=0.2)
+    assert limiter.rate == 500.0
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.19
+
+def test_rate_recovers_quickly_after_throttling():
+    limiter = RateLimiter(rate=20.0, max_rate=40.0)
+    for _ in range(5):
+        limiter.throttled()
+    assert limiter.rate == limiter.min_rate
+    for _ in range(35):  # A fixed step of 0.5 req/s would still be below 19
+        limiter.success()
+    assert limiter.rate >= 20.0
+    for _ in range(100):
+        limiter.success()
+    assert limiter.rate == 40.0
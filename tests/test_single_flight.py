@@ -0,0 +1,46 @@
+import threading
+
+def run_together(*targets):
+    """Start every target at the same moment and wait for all of them"""
+    barrier = threading.Barrier(len(targets))
+    errors = []
+
+    def run(target):
+        barrier.wait()
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+def test_threads_share_one_fetch(make_client, replay):
+    client = make_client(use_cache=False)
+    run_together(*[lambda: client.get_pokemon("gengar")] * 4)
+    assert replay.counts["pokemon/gengar"] == 1
+
+def test_prefetch_and_command_share_one_fetch(make_client, replay):
+    client = make_client(use_cache=False)
+    client.prefetch(["ability/static"])
+    client.get_abilities_many(["static"])
+    client.cancel_prefetch()
+    assert replay.counts["ability/static"] == 1
+
+def test_waves_in_separate_event_loops_share_one_fetch(make_client, replay):
+    client = make_client(use_cache=False)
+    wave = lambda: client.gather("get_stats", ["snorlax"])
+    # Each wave runs its own asyncio loop on its own thread
+    run_together(wave, wave, wave)
+    assert replay.counts["pokemon/snorlax"] == 1
+
+def test_failed_fetch_reaches_every_waiter(make_client, replay):
+    client = make_client(use_cache=False)
+    errors = run_together(*[lambda: client._make_request("pokemon/missingno")] * 3)
+    assert len(errors) == 3
+    assert replay.counts["pokemon/missingno"] == 1
+    assert not client._flights
@@ -0,0 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.misc.snapshot import load_snapshot, save_snapshot
+
+def test_concurrent_saves(tmp_path):
+    path = str(tmp_path / "index.json")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        saves = [executor.submit(save_snapshot, "base", {"pokemon": [str(i)]}, path) for i in range(200)]
+        for save in saves:
+            save.result()
+    assert len(load_snapshot("base", path)["pokemon"]) == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
@@ -0,0 +1,7 @@
+from bench.startup import check
+
+def test_startup_budget():
+    """Importing main and reaching the first prompt stay under budget, first-use modules stay deferred.
+    Set STARTUP_BUDGET_SCALE on slow machines."""
+    report, failures = check(budget_ms=60, prompt_budget_ms=150, repeat=5)
+    assert not failures, report
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.misc.stattable import StatTable
+
+STATS = {
+    "pikachu": {"Hp": 35, "Attack": 55, "Defense": 40, "Special Attack": 50, "Special Defense": 50, "Speed": 90,
+                "Type 1": "Electric", "Type 2": "None"},
+    "gengar": {"Hp": 60, "Attack": 65, "Defense": 60, "Special Attack": 130, "Special Defense": 75, "Speed": 110,
+               "Type 1": "Ghost", "Type 2": "Poison"},
+    "snorlax": {"Hp": 160, "Attack": 110, "Defense": 65, "Special Attack": 65, "Special Defense": 110, "Speed": 30,
+                "Type 1": "Normal", "Type 2": "None"},
+    "jolteon": {"Hp": 65, "Attack": 65, "Defense": 60, "Special Attack": 110, "Special Defense": 95, "Speed": 130,
+                "Type 1": "Electric", "Type 2": "None"},
+    "zapdos": {"Hp": 90, "Attack": 90, "Defense": 85, "Special Attack": 125, "Special Defense": 90, "Speed": 100,
+               "Type 1": "Electric", "Type 2": "Flying"},
+}
+
+@pytest.fixture
+def table():
+    return StatTable.from_stats(STATS)
+
+def names(table, rows):
+    return [table.names[i] for i in rows]
+
+def test_filter_conditions(table):
+    assert names(table, table.query(["speed>100"])) == ["gengar", "jolteon"]
+    assert names(table, table.query(["type=electric", "spa>=110"])) == ["jolteon", "zapdos"]
+    assert names(table, table.query(["type!=electric", "bst<=500"])) == ["gengar"]
+    assert table.mask(["TYPE=Poison"]).tolist() == [False, True, False, False, False]
+
+def test_rank_by_stat_and_total(table):
+    assert names(table, table.query(sort="speed")) == ["jolteon", "gengar", "zapdos", "pikachu", "snorlax"]
+    assert names(table, table.query(["type=electric"], "total", limit=2)) == ["zapdos", "jolteon"]
+    # Ties keep table order, with or without the partial sort a limit uses
+    assert names(table, table.query(sort="atk")) == ["snorlax", "zapdos", "gengar", "jolteon", "pikachu"]
+    assert names(table, table.query(sort="atk", limit=3)) == ["snorlax", "zapdos", "gengar"]
+
+@pytest.mark.parametrize("condition", ["speed~100", "type=fire-ish", "type>fire", "speed>fast", "luck>1"])
+def test_invalid_conditions(table, condition):
+    with pytest.raises(ValueError):
+        table.query([condition])
+
+def test_row_and_save_round_trip(table, tmp_path):
+    path = str(tmp_path / "stats.npz")
+    table.save("base", path)
+    loaded = StatTable.load("base", path)
+    assert loaded.names == table.names
+    assert loaded.row(4) == STATS["zapdos"] | {"Total": 580}
+    assert StatTable.load("other", path) is None
+
+def test_concurrent_saves(table, tmp_path):
+    path = str(tmp_path / "stats.npz")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for save in [executor.submit(table.save, "base", path) for _ in range(50)]:
+            save.result()
+    assert StatTable.load("base", path).names == table.names
+    assert [p.name for p in tmp_path.iterdir()] == ["stats.npz"]
@@ -0,0 +1,56 @@
+import json
+import pytest
+from src.misc.store import LocalStore
+from src.misc.sync import Syncer
+
+LIST_KEY = f"pokemon?limit={Syncer.PAGE_SIZE}&offset=0"
+
+class Interrupting(dict):
+    """Fixtures that stop the sync with Ctrl+C when one key is requested"""
+
+    def __init__(self, fixtures, key):
+        super().__init__(fixtures)
+        self.key = key
+
+    def get(self, key, default=None):
+        if key == self.key:
+            raise KeyboardInterrupt
+        return super().get(key, default)
+
+def add_ids(fixtures):
+    """The sync crawls with its own page size and fetches resources by id"""
+    fixtures[LIST_KEY] = fixtures["pokemon?limit=100&offset=0"]
+    for entry in json.loads(fixtures[LIST_KEY])["results"]:
+        id = entry["url"].rstrip("/").split("/")[-1]
+        fixtures[f"pokemon/{id}"] = fixtures[f"pokemon/{entry['name']}"]
+
+def test_sync_resumes_after_interruption(make_client, replay, tmp_path):
+    add_ids(replay.fixtures)
+    store_path = str(tmp_path / "store.sqlite3")
+    fixtures = replay.fixtures
+    replay.fixtures = Interrupting(fixtures, "pokemon/143")
+    with pytest.raises(KeyboardInterrupt):
+        Syncer(make_client(use_cache=False), LocalStore(store_path), workers=1).run(["pokemon"], verbose=False)
+
+    replay.fixtures = fixtures
+    report = Syncer(make_client(use_cache=False), LocalStore(store_path), workers=1).run(["pokemon"], verbose=False)
+    assert report["pokemon"] == {"Resources": 3, "Fetched": 1, "Unchanged": 2, "Failed": 0}
+    assert replay.counts["pokemon/25"] == replay.counts["pokemon/94"] == 1
+    assert LocalStore(store_path).get("pokemon/snorlax")["id"] == 143
+
+def test_concurrent_checkpoints(make_client, replay, tmp_path):
+    fixtures = replay.fixtures
+    payload = fixtures["pokemon/pikachu"]
+    count = 400
+    for offset in range(0, count, Syncer.PAGE_SIZE):
+        fixtures[f"pokemon?limit={Syncer.PAGE_SIZE}&offset={offset}"] = json.dumps({"count": count, "results": [
+            {"name": f"p{id}", "url": f"pokemon/{id}/"} for id in range(offset, min(offset + Syncer.PAGE_SIZE, count))
+        ]}).encode()
+    fixtures.update({f"pokemon/{id}": payload for id in range(count)})
+    replay.latency = 0.0
+    syncer = Syncer(make_client(use_cache=False), LocalStore(str(tmp_path / "store.sqlite3")), workers=8)
+    syncer.CHECKPOINT_EVERY = 1
+    assert syncer.run(["pokemon"], verbose=False)["pokemon"]["Fetched"] == count
+    with open(syncer.path, encoding="utf-8") as f:
+        assert len(json.load(f)["families"]["pokemon"]["etags"]) == count
+    assert not list(tmp_path.glob("*.tmp"))